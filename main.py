@@ -247,7 +247,7 @@ def main(data_dir=None, gui_out_path=None):
 
         # Consolidated Slack Loop Issues
         sd_issues     = find_slack_dist_mismatches()
-        ug_slack      = find_underground_slack_mismatches(nap_coords, vault_coords, vault_map)
+        ug_slack      = list(find_underground_slack_mismatches(nap_coords, vault_coords, vault_map))
         aerial_loops  = invalid_slack_loops(power_coords, nap_coords, slack_coords)
         tails_issues  = find_distribution_end_tail_issues()
         aerial_issues_data = [
@@ -3,6 +3,8 @@
 
 import logging
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
 def haversine(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
@@ -22,6 +24,20 @@ def haversine(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
     c = 2 * atan2(sqrt(a), sqrt(1 - a))
     return R * c
 
+def haversine_np(lat1, lon1, lat2, lon2) -> np.ndarray:
+    """
+    Vectorized haversine(); arguments are scalars or broadcastable arrays in
+    decimal degrees. Returns meters as a NumPy array.
+    """
+    R = 6371000
+    phi1, phi2 = np.radians(lat1), np.radians(lat2)
+    dphi = np.radians(np.subtract(lat2, lat1))
+    dlambda = np.radians(np.subtract(lon2, lon1))
+
+    a = np.sin(dphi/2)**2 + np.cos(phi1) * np.cos(phi2) * np.sin(dlambda/2)**2
+    c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+    return R * c
+
 # Threshold distance for proximity checks (3 ft ≈ 0.9144 m)
 THRESHOLD_M = 3 / 3.28084
 
@@ -39,4 +55,18 @@ def bearing(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
     x = sin(dlambda) * cos(phi2)
     y = cos(phi1) * sin(phi2) - sin(phi1) * cos(phi2) * cos(dlambda)
     theta = atan2(x, y)
-    return (degrees(theta) + 360) % 360
\ No newline at end of file
+    return (degrees(theta) + 360) % 360
+
+
+def bearing_np(lat1, lon1, lat2, lon2) -> np.ndarray:
+    """
+    Vectorized bearing(); arguments are scalars or broadcastable arrays in
+    decimal degrees. Returns degrees in [0, 360) as a NumPy array.
+    """
+    phi1, phi2 = np.radians(lat1), np.radians(lat2)
+    dlambda = np.radians(np.subtract(lon2, lon1))
+
+    x = np.sin(dlambda) * np.cos(phi2)
+    y = np.cos(phi1) * np.sin(phi2) - np.sin(phi1) * np.cos(phi2) * np.cos(dlambda)
+    theta = np.arctan2(x, y)
+    return (np.degrees(theta) + 360) % 360
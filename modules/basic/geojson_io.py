@@ -0,0 +1,79 @@
+# modules/basic/geojson_io.py
+# Shared GeoJSON file discovery and decoding for the rule modules.
+
+import json
+import os
+from fnmatch import fnmatch
+from functools import lru_cache
+
+import modules.config
+
+# Optional C-accelerated JSON decoders (fall back to stdlib json when missing)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+# Optional streaming parser for very large files
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Files at least this big are streamed feature-by-feature (when ijson is available)
+STREAM_MIN_BYTES = 64 * 1024 * 1024
+
+
+@lru_cache(maxsize=4)
+def _scan_data_dir(data_dir: str, dir_mtime: float) -> tuple[str, ...]:
+    """Every entry of data_dir, listed once per directory mtime (adds/removes/renames bump it)."""
+    with os.scandir(data_dir) as it:
+        return tuple(entry.path for entry in it if not entry.name.startswith("."))
+
+
+def data_files(pattern: str) -> list[str]:
+    """
+    Same matches as glob.glob(f"{DATA_DIR}/{pattern}"), filtered from one
+    cached listing of modules.config.DATA_DIR shared by every rule module.
+    """
+    data_dir = modules.config.DATA_DIR
+    try:
+        dir_mtime = os.path.getmtime(data_dir)
+    except OSError:
+        return []
+    return [p for p in _scan_data_dir(str(data_dir), dir_mtime) if fnmatch(os.path.basename(p), pattern)]
+
+
+def load_json(path: str):
+    """
+    Parse a whole GeoJSON file. Prefers orjson, then msgspec, then stdlib json.
+    """
+    if orjson is not None:
+        with open(path, "rb") as f:
+            return orjson.loads(f.read())
+    if msgspec is not None:
+        with open(path, "rb") as f:
+            return msgspec.json.decode(f.read())
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def is_streamed(path: str) -> bool:
+    """True when iter_features(path) streams the file rather than parsing it whole."""
+    return ijson is not None and os.path.getsize(path) >= STREAM_MIN_BYTES
+
+
+def iter_features(path: str):
+    """
+    Yield the features of a FeatureCollection. Large files are streamed with
+    ijson so the raw text and the full document tree are never held at once;
+    everything else is parsed in one go with load_json.
+    """
+    if is_streamed(path):
+        with open(path, "rb") as f:
+            yield from ijson.items(f, "features.item", use_float=True)
+        return
+    yield from load_json(path).get("features", []) or []
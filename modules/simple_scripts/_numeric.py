@@ -0,0 +1,105 @@
+# modules/simple_scripts/_numeric.py
+# Optional numba kernels for the fixed-radius proximity checks in slack_loops.
+# Everything here needs numba; callers check AVAILABLE and keep their pure
+# Python/NumPy path otherwise.
+
+import math
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+AVAILABLE = njit is not None
+
+
+def _scan(lat, lon, keys, s_lat, s_lon, order, imin, imax, jmin, jmax, width,
+          cell_deg, m_per_deg, thresh_m2, out_pj, start, fill):
+    """
+    Count (and when fill is set, write to out_pj[start:]) the points within
+    sqrt(thresh_m2) metres of (lat, lon). Points are sorted by their packed
+    (lat cell, lon cell) key, so every lat row of the query box is one
+    contiguous key range.
+    """
+    k = math.cos(math.radians(lat))
+    dlon = cell_deg / max(k, 1e-6)
+    n = 0
+    for i in range(int(math.floor((lat - cell_deg) / cell_deg)), int(math.floor((lat + cell_deg) / cell_deg)) + 1):
+        if i < imin or i > imax:
+            continue
+        jlo = max(int(math.floor((lon - dlon) / cell_deg)), jmin)
+        jhi = min(int(math.floor((lon + dlon) / cell_deg)), jmax)
+        if jlo > jhi:
+            continue
+        row = (i - imin) * width - jmin
+        a = np.searchsorted(keys, row + jlo, side='left')
+        b = np.searchsorted(keys, row + jhi, side='right')
+        for t in range(a, b):
+            dy = (s_lat[t] - lat) * m_per_deg
+            dx = (s_lon[t] - lon) * m_per_deg * k
+            if dx * dx + dy * dy <= thresh_m2:
+                if fill:
+                    out_pj[start + n] = order[t]
+                n += 1
+    return n
+
+
+def _count_pairs(q_lat, q_lon, keys, s_lat, s_lon, order, imin, imax, jmin, jmax, width,
+                 cell_deg, m_per_deg, thresh_m2, counts):
+    dummy = np.empty(0, dtype=np.int64)
+    for q in prange(q_lat.shape[0]):
+        counts[q] = _scan(q_lat[q], q_lon[q], keys, s_lat, s_lon, order, imin, imax, jmin, jmax,
+                          width, cell_deg, m_per_deg, thresh_m2, dummy, 0, False)
+
+
+def _fill_pairs(q_lat, q_lon, keys, s_lat, s_lon, order, imin, imax, jmin, jmax, width,
+                cell_deg, m_per_deg, thresh_m2, starts, out_pj):
+    for q in prange(q_lat.shape[0]):
+        _scan(q_lat[q], q_lon[q], keys, s_lat, s_lon, order, imin, imax, jmin, jmax,
+              width, cell_deg, m_per_deg, thresh_m2, out_pj, starts[q], True)
+
+
+if AVAILABLE:
+    _scan = njit(cache=True)(_scan)
+    _count_pairs = njit(cache=True, parallel=True)(_count_pairs)
+    _fill_pairs = njit(cache=True, parallel=True)(_fill_pairs)
+
+
+def pairs_within(q_arr: np.ndarray, p_arr: np.ndarray, cell_deg: float, m_per_deg: float,
+                 thresh_m2: float) -> tuple[np.ndarray, np.ndarray]:
+    """
+    (qi, pj) index arrays of every query/point pair within sqrt(thresh_m2)
+    metres, both inputs (N, 2) lat/lon. Distance is equirectangular with the
+    query's cos(lat); cell_deg must be at least the radius in degrees.
+    Pairs are grouped by query. Requires numba (see AVAILABLE).
+    """
+    nq, npts = q_arr.shape[0], p_arr.shape[0]
+    if nq == 0 or npts == 0:
+        empty = np.empty(0, dtype=np.intp)
+        return empty, empty
+
+    q_lat = np.ascontiguousarray(q_arr[:, 0], dtype=np.float64)
+    q_lon = np.ascontiguousarray(q_arr[:, 1], dtype=np.float64)
+    ci = np.floor(p_arr[:, 0] / cell_deg).astype(np.int64)
+    cj = np.floor(p_arr[:, 1] / cell_deg).astype(np.int64)
+    imin, imax = int(ci.min()), int(ci.max())
+    jmin, jmax = int(cj.min()), int(cj.max())
+    width = jmax - jmin + 1
+    keys = (ci - imin) * width + (cj - jmin)
+    order = np.argsort(keys, kind='stable')
+    keys = keys[order]
+    s_lat = np.ascontiguousarray(p_arr[order, 0], dtype=np.float64)
+    s_lon = np.ascontiguousarray(p_arr[order, 1], dtype=np.float64)
+    order = order.astype(np.int64)
+
+    args = (q_lat, q_lon, keys, s_lat, s_lon, order, imin, imax, jmin, jmax, width,
+            float(cell_deg), float(m_per_deg), float(thresh_m2))
+    counts = np.empty(nq, dtype=np.int64)
+    _count_pairs(*args, counts)
+    starts = np.zeros(nq, dtype=np.int64)
+    np.cumsum(counts[:-1], out=starts[1:])
+    out_pj = np.empty(int(counts.sum()), dtype=np.int64)
+    _fill_pairs(*args, starts, out_pj)
+    return np.repeat(np.arange(nq, dtype=np.intp), counts), out_pj.astype(np.intp)
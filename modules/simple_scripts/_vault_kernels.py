@@ -0,0 +1,205 @@
+# modules/simple_scripts/_vault_kernels.py
+# Optional numba kernels for the vault/conduit proximity checks in vault_rules.
+# Everything here needs numba; callers check AVAILABLE and keep their pure
+# Python/NumPy path otherwise.
+
+import math
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+AVAILABLE = njit is not None
+
+
+def _ptseg(plat, plon, alat, alon, blat, blon):
+    """
+    Point-to-segment distance (meters) and clamped t in [0,1]; the scalar twin
+    of vault_rules._ptseg_distance_t_np (same projection, same clamping).
+    """
+    lat0 = (plat + alat + blat) / 3.0
+    m_per_deg_lat = 111320.0
+    m_per_deg_lon = 111320.0 * math.cos(math.radians(lat0))
+
+    ax, ay = alon * m_per_deg_lon, alat * m_per_deg_lat
+    bx, by = blon * m_per_deg_lon, blat * m_per_deg_lat
+    px, py = plon * m_per_deg_lon, plat * m_per_deg_lat
+
+    vx, vy = bx - ax, by - ay
+    wx, wy = px - ax, py - ay
+    denom = vx * vx + vy * vy
+    t = (wx * vx + wy * vy) / denom if denom > 0.0 else 0.0
+    if t < 0.0:
+        cx, cy, t = ax, ay, 0.0
+    elif t > 1.0:
+        cx, cy, t = bx, by, 1.0
+    else:
+        cx, cy = ax + t * vx, ay + t * vy
+    dx, dy = px - cx, py - cy
+    return math.sqrt(dx * dx + dy * dy), t
+
+
+def _scan(plat, plon, tol_m, ends, bbox, keys, cell_edge, e_ilo, e_jlo, big, imin, imax, jmin, jmax, width, cell_deg,
+          mode, out_ej, out_d, out_t, start):
+    """
+    Visit every edge within tol_m of (plat, plon) once. Edges are filed under
+    every cell their box overlaps, sorted by packed (lat cell, lon cell) key,
+    so each lat row of the query window is one contiguous key range; an edge
+    seen in several cells is only taken in the first cell shared by its box
+    and the window, and only measured when its box padded by tol_m holds the
+    point. Oversized edges (big) are not in the cells and are visited for
+    every point.
+    mode 0: return 1 at the first hit. mode 1: count hits.
+    mode 2: also write hits to out_*[start:].
+    """
+    pad_lat = tol_m / 111000.0
+    pad_lon = 1.1 * pad_lat / max(math.cos(math.radians(plat)), 1e-6)
+    qi_lo = int(math.floor((plat - pad_lat) / cell_deg))
+    qi_hi = int(math.floor((plat + pad_lat) / cell_deg))
+    qj_lo = int(math.floor((plon - pad_lon) / cell_deg))
+    qj_hi = int(math.floor((plon + pad_lon) / cell_deg))
+    n = 0
+    for i in range(max(qi_lo, imin), min(qi_hi, imax) + 1):
+        jlo = max(qj_lo, jmin)
+        jhi = min(qj_hi, jmax)
+        if jlo > jhi:
+            continue
+        row = (i - imin) * width - jmin
+        a = np.searchsorted(keys, row + jlo, side='left')
+        b = np.searchsorted(keys, row + jhi, side='right')
+        for k in range(a, b):
+            e = cell_edge[k]
+            j = keys[k] - row
+            if i != max(qi_lo, e_ilo[e]) or j != max(qj_lo, e_jlo[e]):
+                continue
+            if (plat < bbox[e, 0] - pad_lat or plat > bbox[e, 2] + pad_lat
+                    or plon < bbox[e, 1] - pad_lon or plon > bbox[e, 3] + pad_lon):
+                continue
+            d, t = _ptseg(plat, plon, ends[e, 0], ends[e, 1], ends[e, 2], ends[e, 3])
+            if d <= tol_m:
+                if mode == 0:
+                    return 1
+                if mode == 2:
+                    out_ej[start + n] = e
+                    out_d[start + n] = d
+                    out_t[start + n] = t
+                n += 1
+    for e in big:
+        if (plat < bbox[e, 0] - pad_lat or plat > bbox[e, 2] + pad_lat
+                or plon < bbox[e, 1] - pad_lon or plon > bbox[e, 3] + pad_lon):
+            continue
+        d, t = _ptseg(plat, plon, ends[e, 0], ends[e, 1], ends[e, 2], ends[e, 3])
+        if d <= tol_m:
+            if mode == 0:
+                return 1
+            if mode == 2:
+                out_ej[start + n] = e
+                out_d[start + n] = d
+                out_t[start + n] = t
+            n += 1
+    return n
+
+
+def _any_within(q_lat, q_lon, tol_m, ends, bbox, keys, cell_edge, e_ilo, e_jlo, big, imin, imax, jmin, jmax, width,
+                cell_deg, out):
+    no_ej = np.empty(0, dtype=np.int64)
+    no_f = np.empty(0, dtype=np.float64)
+    for q in prange(q_lat.shape[0]):
+        out[q] = _scan(q_lat[q], q_lon[q], tol_m, ends, bbox, keys, cell_edge, e_ilo, e_jlo, big, imin, imax,
+                       jmin, jmax, width, cell_deg, 0, no_ej, no_f, no_f, 0) > 0
+
+
+def _count_pairs(q_lat, q_lon, tol_m, ends, bbox, keys, cell_edge, e_ilo, e_jlo, big, imin, imax, jmin, jmax, width,
+                 cell_deg, counts):
+    no_ej = np.empty(0, dtype=np.int64)
+    no_f = np.empty(0, dtype=np.float64)
+    for q in prange(q_lat.shape[0]):
+        counts[q] = _scan(q_lat[q], q_lon[q], tol_m, ends, bbox, keys, cell_edge, e_ilo, e_jlo, big, imin, imax,
+                          jmin, jmax, width, cell_deg, 1, no_ej, no_f, no_f, 0)
+
+
+def _fill_pairs(q_lat, q_lon, tol_m, ends, bbox, keys, cell_edge, e_ilo, e_jlo, big, imin, imax, jmin, jmax, width,
+                cell_deg, starts, out_ej, out_d, out_t):
+    for q in prange(q_lat.shape[0]):
+        _scan(q_lat[q], q_lon[q], tol_m, ends, bbox, keys, cell_edge, e_ilo, e_jlo, big, imin, imax, jmin, jmax,
+              width, cell_deg, 2, out_ej, out_d, out_t, starts[q])
+
+
+if AVAILABLE:
+    _ptseg = njit(cache=True)(_ptseg)
+    _scan = njit(cache=True)(_scan)
+    _any_within = njit(cache=True, parallel=True)(_any_within)
+    _count_pairs = njit(cache=True, parallel=True)(_count_pairs)
+    _fill_pairs = njit(cache=True, parallel=True)(_fill_pairs)
+
+
+def edge_cells(bbox: np.ndarray, cell_deg: float, oversized: np.ndarray) -> tuple:
+    """
+    Cell table for edge boxes bbox (E, 4) min_lat, min_lon, max_lat, max_lon:
+    every edge filed under each cell its box overlaps, as sorted packed keys
+    with the edge of each entry. Edges listed in oversized are left out of
+    the cells and scanned for every query instead. Pass the result to
+    any_edge_within / edge_pairs_within.
+    """
+    if bbox.shape[0] == 0:
+        return None
+    e_ilo = np.floor(bbox[:, 0] / cell_deg).astype(np.int64)
+    e_jlo = np.floor(bbox[:, 1] / cell_deg).astype(np.int64)
+    ni = np.floor(bbox[:, 2] / cell_deg).astype(np.int64) - e_ilo + 1
+    nj = np.floor(bbox[:, 3] / cell_deg).astype(np.int64) - e_jlo + 1
+    big = np.asarray(oversized, dtype=np.int64)
+
+    # Expand each edge into its ni * nj cells
+    per_edge = ni * nj
+    per_edge[big] = 0
+    edge = np.repeat(np.arange(bbox.shape[0], dtype=np.int64), per_edge)
+    first = np.cumsum(per_edge) - per_edge
+    k = np.arange(edge.shape[0], dtype=np.int64) - np.repeat(first, per_edge)
+    ci = e_ilo[edge] + k // nj[edge]
+    cj = e_jlo[edge] + k % nj[edge]
+
+    if edge.shape[0] == 0:
+        # every edge is oversized: an empty window (imax < imin) skips the cell loop
+        imin, imax, jmin, jmax = 0, -1, 0, -1
+    else:
+        imin, imax = int(ci.min()), int(ci.max())
+        jmin, jmax = int(cj.min()), int(cj.max())
+    width = jmax - jmin + 1
+    keys = (ci - imin) * width + (cj - jmin)
+    order = np.argsort(keys, kind='stable')
+    return (keys[order], edge[order], e_ilo, e_jlo, big, imin, imax, jmin, jmax, width, float(cell_deg))
+
+
+def any_edge_within(pts: np.ndarray, ends: np.ndarray, bbox: np.ndarray, cells: tuple, tol_m: float) -> np.ndarray:
+    """Bool per point of pts (N, 2) lat/lon: is any edge of ends (boxes bbox) within tol_m?"""
+    out = np.zeros(pts.shape[0], dtype=np.bool_)
+    if pts.shape[0] == 0 or cells is None:
+        return out
+    _any_within(np.ascontiguousarray(pts[:, 0]), np.ascontiguousarray(pts[:, 1]), float(tol_m), ends, bbox, *cells, out)
+    return out
+
+
+def edge_pairs_within(pts: np.ndarray, ends: np.ndarray, bbox: np.ndarray, cells: tuple,
+                      tol_m: float) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    (vi, ej, d_m, t) for every point / edge pair within tol_m, grouped by
+    point; d_m and t as _ptseg returns them. Requires numba (see AVAILABLE).
+    """
+    nq = pts.shape[0]
+    if nq == 0 or cells is None:
+        return (np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp),
+                np.empty(0, dtype=np.float64), np.empty(0, dtype=np.float64))
+    args = (np.ascontiguousarray(pts[:, 0]), np.ascontiguousarray(pts[:, 1]), float(tol_m), ends, bbox, *cells)
+    counts = np.empty(nq, dtype=np.int64)
+    _count_pairs(*args, counts)
+    starts = np.zeros(nq, dtype=np.int64)
+    np.cumsum(counts[:-1], out=starts[1:])
+    total = int(counts.sum())
+    out_ej = np.empty(total, dtype=np.int64)
+    out_d = np.empty(total, dtype=np.float64)
+    out_t = np.empty(total, dtype=np.float64)
+    _fill_pairs(*args, starts, out_ej, out_d, out_t)
+    return np.repeat(np.arange(nq, dtype=np.intp), counts), out_ej.astype(np.intp), out_d, out_t
@@ -2,8 +2,8 @@
 # Everything to do with distribution lines; including Aerial and Underground.
 import logging
 import glob
-import json
 import modules.config
+from modules.basic.geojson_io import iter_features
 
 logger = logging.getLogger(__name__)
 
@@ -15,9 +15,7 @@ def _load_underground_distributions():
     mapping = {}
 
     for fn in glob.glob(f'{modules.config.DATA_DIR}/*fiber-distribution-underground*.geojson'):
-        with open(fn, encoding='utf-8') as f:
-            gj = json.load(f)
-        for feat in gj.get('features', []):
+        for feat in iter_features(fn):
             props = feat.get('properties', {})
             dist_id = props.get('ID')
             geom    = feat.get('geometry', {})
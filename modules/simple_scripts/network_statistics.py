@@ -82,10 +82,10 @@ def collect_network_statistics():
 
     # Slack-related issues
     slack_dist_issues = len(find_slack_dist_mismatches())
-    underground_slack_issues = len(find_underground_slack_mismatches(nap_coords, vault_coords, vault_map))
+    underground_slack_issues = sum(1 for _ in find_underground_slack_mismatches(nap_coords, vault_coords, vault_map))
     slack_raw = _load_slack_loops_with_labels_and_coords()
     slack_coords = {(lat, lon) for lat, lon, *_ in slack_raw}
-    aerial_slack_issues = len(invalid_slack_loops(pole_coords, nap_coords, slack_coords))
+    aerial_slack_issues = sum(1 for _ in invalid_slack_loops(pole_coords, nap_coords, slack_coords))
     tail_end_slack_issues = len(find_distribution_end_tail_issues())
 
     # Footage issues (Distribution Note missing/invalid + Drops > 250 ft)
@@ -2,9 +2,16 @@
 # All rules and validations for service locations.
 
 import logging
-import json
-import glob
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import NamedTuple
+
+import numpy as np
+
 import modules.config
+from modules.basic.geojson_io import data_files, iter_features, load_json
 from modules.basic.log_configs import log_abbrev_header, log_issue_header
 from modules.hard_scripts.distribution_walker import get_walk_order_index_map, get_walk_paths_map
 from modules.basic.fiber_colors import FIBER_COLORS
@@ -12,7 +19,50 @@ from modules.basic.fiber_colors import FIBER_COLORS
 logger = logging.getLogger(__name__)
 
 
-def _validate_splice_colors(raw: str):
+def _svcloc_geojson_files(pattern: str = "*service-location*.geojson") -> tuple[str, ...]:
+    """
+    Sorted service-location GeoJSON paths in modules.config.DATA_DIR, from the
+    shared directory listing (re-scanned when the directory mtime changes, so
+    the GUI picks up added/removed files between runs).
+    """
+    return tuple(sorted(data_files(pattern)))
+
+
+def _load_svcloc_props(path: str) -> dict[str, dict]:
+    """Slimmed {sid: properties} for one service-location file."""
+    return _props_by_sid(iter_features(path), slim=True)
+
+
+def _try_load_svcloc_props(path: str):
+    """Return (path, props_by_sid, error) so per-file failures survive a pool map."""
+    try:
+        return path, _load_svcloc_props(path), None
+    except Exception as e:
+        return path, None, e
+
+
+def _classify_token(t: str, fiber_set, fiber_lc_set, fiber_list) -> bool:
+    """
+    True if a single (stripped, non-empty) Splice Colors token is acceptable.
+    One find('-') decides the shape:
+      • "N - Name" → right must be canonical, else left must be 1..12
+      • otherwise  → starts with a canonical color (any case), or is 1..12
+    """
+    pos = t.find("-")
+    if pos >= 0:
+        if t[pos + 1:].strip() in fiber_set:
+            return True
+        n = t[:pos].strip()
+        return n.isdecimal() and 1 <= int(n) <= len(fiber_list)
+
+    tl = t.lower()
+    if any(tl.startswith(c) for c in fiber_lc_set):
+        return True
+    return t.isdecimal() and 1 <= int(t) <= len(fiber_list)
+
+
+@lru_cache(maxsize=4096)
+def _validate_splice_colors_cached(raw: str):
     """
     Return None if OK; otherwise a dict row with Issue='Misspelt Attribute'.
 
@@ -26,111 +76,156 @@ def _validate_splice_colors(raw: str):
     """
     s = _canonicalize(raw)
     if not s:
-        return {"Attribute": "Splice Colors", "Value": "", "Issue": "Missing Attribute"}
+        return ("Splice Colors", "", "Missing Attribute")
 
-    tokens = re.split(r"[,\n;/]+", s)
+    tokens = s.translate(_SEP_TRANS).split("\n")
     bad = []
 
-    def _by_num(nstr: str):
-        try:
-            n = int(nstr.strip())
-        except Exception:
-            return None
-        return _FIBER_COLORS[n - 1] if 1 <= n <= len(_FIBER_COLORS) else None
-
     for tok in tokens:
         t = tok.strip()
         if not t:
             continue
-        original = t
-
-        # "N - Name" → Name (prefer right)
-        if "-" in t:
-            left, right = [p.strip() for p in t.split("-", 1)]
-            if right in _FIBER_COLORS:
-                continue
-            if left.isdigit() and _by_num(left):
-                continue
-            bad.append(original)
+        # Common case: a bare color name (any case) or 1..12 → one hash lookup
+        if t.lower() in _COLOR_LOOKUP:
             continue
+        if not _classify_token(t, _FIBER_SET, _FIBER_LC_SET, _FIBER_COLORS):
+            bad.append(t)
 
-        # startswith canonical color (handles "Black 1.1")
-        tl = t.lower()
-        if any(tl.startswith(c.lower()) for c in _FIBER_COLORS):
-            continue
+    if bad:
+        return ("Splice Colors", f"{s} [invalid: {', '.join(bad)}]", "Misspelt Attribute")
+    return None
 
-        # pure numeric 1..12 ok
-        if t.isdigit() and _by_num(t):
-            continue
 
-        # anything else is invalid
-        bad.append(original)
+def _validate_splice_colors(raw: str):
+    """
+    Dict-returning wrapper around _validate_splice_colors_cached. The *_cached
+    validators return (Attribute, Value, Issue) tuples or None.
+    """
+    return _issue_dict(_validate_splice_colors_cached(raw))
 
-    if bad:
-        return {
-            "Attribute": "Splice Colors",
-            "Value": f"{s} [invalid: {', '.join(bad)}]",
-            "Issue": "Misspelt Attribute",
-        }
-    return None
+
+_SVC_ID_KEYS = ("Service Location ID", "ID")
+
+
+class SvcLocTable(NamedTuple):
+    """
+    Service locations as parallel columns (row i is the same SL in every array).
+    coords is float64 (N, 2) of (lat, lon) rounded to 6 decimals; the rest are
+    object arrays of stripped strings.
+    """
+    coords: np.ndarray
+    loose: np.ndarray
+    splice: np.ndarray
+    svc_id: np.ndarray
 
 
-def load_service_locations() -> list[tuple]:
+def load_service_locations() -> SvcLocTable:
     """
-    Load Service Location features: returns list of
-    (lat, lon, loose_tube, splice_colors, svc_id).
+    Load Service Location features into a SvcLocTable so proximity work can run
+    on the coords array directly. Use load_service_locations_tuples() for the
+    old list of (lat, lon, loose_tube, splice_colors, svc_id).
     """
-    out = []
-    pattern = f"{modules.config.DATA_DIR}/*service-location*.geojson"
-    files = glob.glob(pattern)
+    files = list(_svcloc_geojson_files())
 
-    if getattr(modules.config, "LOG_SVCLOC_DEBUG", False):
+    log_dbg = getattr(modules.config, "LOG_SVCLOC_DEBUG", False)
+    if log_dbg:
         logger.debug(f"[SvcLoc] Scanning files: {files}")
 
+    latlon: list[float] = []   # flat lat, lon, lat, lon, …
+    loose: list[str] = []
+    splice: list[str] = []
+    svc_ids: list[str] = []
+
+    # Hot loop: bind builtins / methods to locals once
+    _strip, _round = str.strip, round
+    _add_ll, _add_lt, _add_sc, _add_id = latlon.extend, loose.append, splice.append, svc_ids.append
+    _id_key, _id_fallback = _SVC_ID_KEYS
+
     for fn in files:
         try:
-            with open(fn, encoding='utf-8') as f:
-                gj = json.load(f)
+            gj = load_json(fn)
         except Exception as e:
             logger.error(f"Failed to load Service Locations from {fn}: {e}")
             continue
 
         feats = gj.get("features", [])
-        if getattr(modules.config, "LOG_SVCLOC_DEBUG", False):
+        if log_dbg:
             logger.debug(f"[SvcLoc] {fn}: {len(feats)} features")
 
         for feat in feats:
-            props  = feat.get("properties", {}) or {}
-            geom   = feat.get("geometry", {}) or {}
-            coords = geom.get("coordinates", []) or []
+            coords = (feat.get("geometry") or {}).get("coordinates") or []
             if len(coords) < 2:
-                if getattr(modules.config, "LOG_SVCLOC_DEBUG", False):
+                if log_dbg:
                     logger.debug(f"[SvcLoc] Skipping bad geometry in {fn}: {coords!r}")
                 continue
 
+            get = (feat.get("properties") or {}).get
             lon, lat = coords[:2]
-            loose    = (props.get("Loose Tube")    or "").strip()
-            splice   = (props.get("Splice Colors") or "").strip()
-            svc_id   = (props.get("Service Location ID") or props.get("ID") or "").strip()
-
-            out.append((round(lat, 6), round(lon, 6), loose, splice, svc_id))
+            _add_ll((_round(lat, 6), _round(lon, 6)))
+            _add_lt(_strip(get("Loose Tube") or ""))
+            _add_sc(_strip(get("Splice Colors") or ""))
+            _add_id(_strip(get(_id_key) or get(_id_fallback) or ""))
+
+    if log_dbg:
+        logger.debug(f"[SvcLoc] Loaded {len(svc_ids)} total service locations")
+
+    return SvcLocTable(
+        coords=np.fromiter(latlon, dtype=np.float64, count=len(latlon)).reshape(-1, 2),
+        loose=np.array(loose, dtype=object),
+        splice=np.array(splice, dtype=object),
+        svc_id=np.array(svc_ids, dtype=object),
+    )
 
-    if getattr(modules.config, "LOG_SVCLOC_DEBUG", False):
-        logger.debug(f"[SvcLoc] Loaded {len(out)} total service-location tuples")
 
-    return out
+def load_service_locations_tuples() -> list[tuple]:
+    """
+    Compatibility shim: list of (lat, lon, loose_tube, splice_colors, svc_id)
+    as returned by load_service_locations() before it moved to SvcLocTable.
+    """
+    t = load_service_locations()
+    return [
+        (lat, lon, lt, sc, sid)
+        for (lat, lon), lt, sc, sid in zip(t.coords.tolist(), t.loose.tolist(), t.splice.tolist(), t.svc_id.tolist())
+    ]
 
 # ───────────────────────── helpers & constants ─────────────────────────
 def _canonicalize(s: str) -> str:
     return (s or "").strip()
 
-_ALLOWED_BUILD_TYPE = {
+def _issue_dict(res):
+    """(Attribute, Value, Issue) tuple → row dict; None passes through."""
+    if res is None:
+        return None
+    attr, value, issue = res
+    return {"Attribute": attr, "Value": value, "Issue": issue}
+
+# The only properties the SL checks read; everything else is dropped at load when slimming
+_REQUIRED_KEYS = (
+    "Build Type", "Building Type", "Drop Type", "NAP #", "NAP Location", "Loose Tube",
+    "Splice Colors", "Service Location ID", "ID", "vetro_id", "NAP Number",
+)
+
+def _props_by_sid(features, slim: bool = False) -> dict[str, dict]:
+    """
+    {sid: properties} for every feature with a usable Service Location ID
+    (falls back to 'ID', then 'vetro_id'). Later features win on duplicates.
+    With slim=True only _REQUIRED_KEYS are kept, to bound memory on big files.
+    """
+    _strip = str.strip
+    return {
+        sid: ({k: props[k] for k in _REQUIRED_KEYS if k in props} if slim else props)
+        for feat in features
+        for props in (((feat.get("properties") or {}) if isinstance(feat, dict) else {}),)
+        if (sid := _strip(props.get("Service Location ID") or props.get("ID") or props.get("vetro_id") or ""))
+    }
+
+_ALLOWED_BUILD_TYPE = frozenset({
     "RSVD", "Future", "Aerial", "Underground",
-}
-_ALLOWED_BUILDING_TYPE = {
+})
+_ALLOWED_BUILDING_TYPE = frozenset({
     "Residential", "Commercial", "MDU (Multi-Dwelling Unit)", "Government",
-}
-_ALLOWED_DROP_TYPE = {
+})
+_ALLOWED_DROP_TYPE = frozenset({
     "Aerial",
     "Underground",
     "Aerial to Underground",
@@ -138,27 +233,46 @@ _ALLOWED_DROP_TYPE = {
     "Aerial to Underground to Aerial",
     "Underground to Aerial to Underground",
     "Aerial Midspan",
-}
-_ALLOWED_NAP_LOCATION = {"Aerial", "Underground"}
+})
+_ALLOWED_NAP_LOCATION = frozenset({"Aerial", "Underground"})
+
+# Pick-list attributes validated as "exactly one of"
+_PICKLIST_ATTRS = (
+    ("Build Type", _ALLOWED_BUILD_TYPE),
+    ("Building Type", _ALLOWED_BUILDING_TYPE),
+    ("Drop Type", _ALLOWED_DROP_TYPE),
+    ("NAP Location", _ALLOWED_NAP_LOCATION),
+)
 
 # Loose Tube: only these 6 colors
-_ALLOWED_LOOSE_TUBE = {"Blue", "Orange", "Green", "Brown", "Slate", "White"}
+_ALLOWED_LOOSE_TUBE = frozenset({"Blue", "Orange", "Green", "Brown", "Slate", "White"})
 
 # Canonical 12-color order (already the project standard)
 _FIBER_COLORS = [
     "Blue","Orange","Green","Brown","Slate","White",
     "Red","Black","Yellow","Violet","Rose","Aqua",
 ]
+_FIBER_SET    = frozenset(_FIBER_COLORS)
+_FIBER_LC_SET = frozenset(c.lower() for c in _FIBER_COLORS)
 
-import re
+# Lowercased name or 1-based position → canonical color
+_COLOR_LOOKUP = {c.lower(): c for c in _FIBER_COLORS}
+_COLOR_LOOKUP.update({str(i + 1): c for i, c in enumerate(_FIBER_COLORS)})
 
-def _validate_dropdown(attr_name: str, raw: str, allowed: set[str]):
+# Splice Colors separators: fold ',', ';', '/' onto '\n' so one str.split does it
+_SEP_TRANS = str.maketrans({",": "\n", ";": "\n", "/": "\n"})
+
+@lru_cache(maxsize=4096)
+def _validate_dropdown_cached(attr_name: str, raw: str, allowed_fs: frozenset[str]):
     s = _canonicalize(raw)
     if not s:
-        return {"Attribute": attr_name, "Value": "", "Issue": "Missing Attribute"}
-    if s in allowed:
+        return (attr_name, "", "Missing Attribute")
+    if s in allowed_fs:
         return None
-    return {"Attribute": attr_name, "Value": s, "Issue": "Invalid Choice"}
+    return (attr_name, s, "Invalid Choice")
+
+def _validate_dropdown(attr_name: str, raw: str, allowed: set[str]):
+    return _issue_dict(_validate_dropdown_cached(attr_name, raw, frozenset(allowed)))
 
 def _validate_nap_number(raw):
     """
@@ -176,7 +290,6 @@ def _validate_nap_number(raw):
         return {"Attribute": "NAP #", "Value": "", "Issue": "Missing Attribute"}
 
     # Only integers or .5 allowed, >= 1 (e.g., 24 / 24.5)
-    import re
     if re.fullmatch(r"\d+(?:\.5)?", s):
         try:
             val = float(s)
@@ -188,68 +301,68 @@ def _validate_nap_number(raw):
     return {"Attribute": "NAP #", "Value": s, "Issue": "Invalid Number"}
 
 
-def _validate_loose_tube(raw):
+@lru_cache(maxsize=4096)
+def _validate_loose_tube_cached(raw):
     s = _canonicalize(raw)
     if not s:
-        return {"Attribute": "Loose Tube", "Value": "", "Issue": "Missing Attribute"}
+        return ("Loose Tube", "", "Missing Attribute")
     if s in _ALLOWED_LOOSE_TUBE:
         return None
     # treat everything else as “misspelt/invalid”
-    return {"Attribute": "Loose Tube", "Value": s, "Issue": "Misspelt Attribute"}
+    return ("Loose Tube", s, "Misspelt Attribute")
 
 
-def check_service_location_attributes(service_locations_by_id_or_path, logger=None, log_debug: bool = True):
-    """
-    VALIDATION + ORDERING:
-    • Maintains deep-walk path order (then stable NAP grouping for unknowns).
-    • Returns rows with: 'Service Location ID', 'Attribute', 'Value', 'Issue'.
+def _validate_loose_tube(raw):
+    return _issue_dict(_validate_loose_tube_cached(raw))
 
-    Rules:
-    - Build Type, Building Type, Drop Type, NAP Location: * must be exactly one of the allowed values; empty → Missing Attribute
-    - NAP #: * must be numeric (N or N.5), >= 1; empty → Missing Attribute
-    - Loose Tube: * must be one of 6 canonical colors; empty → Missing Attribute; else Misspelt Attribute
-    - Splice Colors: * must parse to 1–12 canonical colors; empty → Missing Attribute; else Misspelt Attribute on bad tokens
 
-    NEW:
-    - If Service Location 'Build Type' is RSVD or Future, skip unless enabled via:
-        modules.config.get_pref('include_rsvd_sl', False) / modules.config.get_pref('include_future_sl', False)
-    """
-    import json, re, logging
-    import modules.config
-    from modules.basic.log_configs import log_abbrev_header, log_issue_header
-    from modules.hard_scripts.distribution_walker import (
-        get_walk_order_index_map, get_walk_paths_map
-    )
-    logger = logger or logging.getLogger(__name__)
+# ───────────────────────── ordering helpers ─────────────────────────
+_NAP_BIG = 10**9
+_NAP_TOKEN_RE = re.compile(r"\bN\s*#?\s*\d+\b")
+_NAP_NUM_RE   = re.compile(r"\bN\s*#?\s*(\d+)\b", re.IGNORECASE)
 
-    detail    = str(getattr(modules.config, "LOG_DETAIL", "DEBUG")).upper()
-    do_info   = (detail == "INFO" and log_debug)
-    do_debug  = bool(log_debug and getattr(modules.config, "LOG_SVCLOC_DEBUG", False))
-    show_path = bool(getattr(modules.config, "LOG_INCLUDE_WALK_PATH", False))
 
-    # Load either dict or single file
-    sl_props_by_id: dict[str, dict] = {}
-    if isinstance(service_locations_by_id_or_path, dict):
-        sl_props_by_id = service_locations_by_id_or_path
-    elif isinstance(service_locations_by_id_or_path, str):
-        src_path = service_locations_by_id_or_path
-        try:
-            with open(src_path, "r", encoding="utf-8") as f:
-                gj = json.load(f)
-            for feat in gj.get("features", []):
-                props = (feat.get("properties") or {}) if isinstance(feat, dict) else {}
-                sid = (props.get("Service Location ID") or props.get("ID") or props.get("vetro_id") or "").strip()
-                if sid:
-                    sl_props_by_id[sid] = props
-        except Exception as e:
-            logger.error(f"[SvcLoc] Failed to load {src_path}: {e}")
-            return []
-    else:
-        logger.error(f"[SvcLoc] Unsupported input type: {type(service_locations_by_id_or_path)}")
-        return []
+def _extract_n_from_path(path_str: str) -> str:
+    """First '→'-separated token of a walk path that looks like a NAP (N #)."""
+    if not path_str:
+        return ""
+    tokens = [t.strip() for t in path_str.split("→")]
+    for t in tokens:
+        if _NAP_TOKEN_RE.search(t):
+            return t
+    return ""
 
-    log_abbrev_header()
 
+def _nap_from_props(props: dict) -> str:
+    return str(props.get("NAP #") or props.get("NAP Number") or "").strip()
+
+
+def _nap_numeric(nap_id: str) -> int:
+    if not nap_id:
+        return _NAP_BIG
+    m = _NAP_NUM_RE.search(nap_id)
+    if m:
+        return int(m.group(1))
+    if nap_id.isdigit():
+        return int(nap_id)
+    return _NAP_BIG
+
+
+def _sort_key(sid: str, order_map: dict, paths_map: dict, sl_props_by_id: dict):
+    """Walk order first; SLs the walker never reached follow, grouped by NAP number."""
+    idx = order_map.get(sid)
+    if idx is not None:
+        return (0, idx, sid)
+    nap_id = _extract_n_from_path(paths_map.get(sid, "")) or _nap_from_props(sl_props_by_id.get(sid) or {})
+    return (1, _nap_numeric(nap_id), sid)
+
+
+def _run_svcloc_checks(sl_props_by_id: dict[str, dict], logger, do_info: bool, do_debug: bool,
+                       show_path: bool) -> list[dict]:
+    """
+    Shared core of both check_* entry points: order the SLs, validate every
+    attribute, and emit the per-SL / summary logs. Returns the issue rows.
+    """
     # Walker order & paths
     order_map = get_walk_order_index_map()  # {sid: 1..N}
     try:
@@ -257,44 +370,14 @@ def check_service_location_attributes(service_locations_by_id_or_path, logger=No
     except Exception:
         _paths = {}
 
-    BIG = 10**9
-
-    def _extract_n_from_path(path_str: str) -> str:
-        if not path_str:
-            return ""
-        tokens = [t.strip() for t in path_str.split("→")]
-        for t in tokens:
-            if re.search(r"\bN\s*#?\s*\d+\b", t):
-                return t
-        return ""
-
-    def _nap_from_props(sid: str) -> str:
-        props = sl_props_by_id.get(sid) or {}
-        return str(props.get("NAP #") or props.get("NAP Number") or "").strip()
-
-    def _nap_numeric(nap_id: str) -> int:
-        if not nap_id:
-            return BIG
-        m = re.search(r"\bN\s*#?\s*(\d+)\b", nap_id, re.IGNORECASE)
-        if m:
-            return int(m.group(1))
-        if nap_id.isdigit():
-            return int(nap_id)
-        return BIG
-
-    def _nap_for_sid(sid: str) -> str:
-        return _extract_n_from_path(_paths.get(sid, "")) or _nap_from_props(sid)
-
-    def _sort_key(sid: str):
-        idx = order_map.get(sid)
-        if idx is not None:
-            return (0, idx, sid)
-        return (1, _nap_numeric(_nap_for_sid(sid)), sid)
-
-    ids = sorted(sl_props_by_id.keys(), key=_sort_key)
+    # Decorate-sort-undecorate: one key (and its regex work) per SID
+    keyed = [(_sort_key(sid, order_map, _paths, sl_props_by_id), sid) for sid in sl_props_by_id]
+    keyed.sort()
+    ids = [sid for _key, sid in keyed]
     next_ordinal = (max(order_map.values()) if order_map else 0) + 1
 
-    rows: list[dict] = []
+    rows: list[tuple[str, str, str, str]] = []  # (sid, attr, value, issue); dicts built on return
+    issues_by_sid: dict[str, list[str]] = {}  # sid -> Issue kinds, filled alongside rows
     header_lines: list[str] = []
 
     # NEW: read inclusion toggles once
@@ -313,37 +396,41 @@ def check_service_location_attributes(service_locations_by_id_or_path, logger=No
         if (bt == "rsvd" and not _include_rsvd) or (bt == "future" and not _include_future):
             continue
 
-        # 1) Pick-list attributes
-        for attr, allowed in (
-            ("Build Type", _ALLOWED_BUILD_TYPE),
-            ("Building Type", _ALLOWED_BUILDING_TYPE),
-            ("Drop Type", _ALLOWED_DROP_TYPE),
-            ("NAP Location", _ALLOWED_NAP_LOCATION),
-        ):
-            res = _validate_dropdown(attr, props.get(attr), allowed)
-            if res:
-                rows.append({"Service Location ID": sid, **res})
+        # 1) Pick-list attributes (happy path is a single frozenset lookup;
+        #    mirrors _validate_dropdown without the call/dict overhead)
+        for attr, allowed in _PICKLIST_ATTRS:
+            raw = (props.get(attr) or "").strip()
+            if raw in allowed:
+                continue
+            issue = "Invalid Choice" if raw else "Missing Attribute"
+            rows.append((sid, attr, raw, issue))
+            issues_by_sid.setdefault(sid, []).append(issue)
 
         # 2) NAP #
         res = _validate_nap_number(props.get("NAP #"))
         if res:
-            rows.append({"Service Location ID": sid, **res})
+            rows.append((sid, res["Attribute"], res["Value"], res["Issue"]))
+            issues_by_sid.setdefault(sid, []).append(res["Issue"])
 
-        # 3) Loose Tube
-        res = _validate_loose_tube(props.get("Loose Tube"))
-        if res:
-            rows.append({"Service Location ID": sid, **res})
+        # 3) Loose Tube (inlined _validate_loose_tube)
+        raw = (props.get("Loose Tube") or "").strip()
+        if raw not in _ALLOWED_LOOSE_TUBE:
+            issue = "Misspelt Attribute" if raw else "Missing Attribute"
+            rows.append((sid, "Loose Tube", raw, issue))
+            issues_by_sid.setdefault(sid, []).append(issue)
 
         # 4) Splice Colors
-        res = _validate_splice_colors(props.get("Splice Colors"))
+        res = _validate_splice_colors_cached(props.get("Splice Colors"))
         if res:
-            rows.append({"Service Location ID": sid, **res})
+            rows.append((sid, *res))
+            issues_by_sid.setdefault(sid, []).append(res[2])
 
         # Per-line logging (INFO mode)
         if do_info:
             path_part = f" — path={_paths[sid]}" if (show_path and _paths.get(sid)) else ""
-            if any(r["Service Location ID"] == sid for r in rows):
-                kinds = ", ".join(sorted({r["Issue"] for r in rows if r["Service Location ID"] == sid}))
+            kinds_list = issues_by_sid.get(sid)
+            if kinds_list:
+                kinds = ", ".join(sorted(set(kinds_list)))
                 logger.info(f"[Check Service Location Attributes] ❌ SL # {sl_num}: {sid} — {kinds}{path_part}")
                 header_lines.append(f"SL # {sl_num}: {sid} — {kinds}{path_part}")
             else:
@@ -354,147 +441,91 @@ def check_service_location_attributes(service_locations_by_id_or_path, logger=No
 
     if do_debug:
         logger.debug(f"• [SvcLoc] Total SL attribute rows (incl. spelling/choice/number): {len(rows)}")
-    return rows
+    return [
+        {"Service Location ID": s, "Attribute": a, "Value": v, "Issue": i}
+        for (s, a, v, i) in rows
+    ]
 
 
-def check_all_service_location_attributes(log_debug: bool = True):
+def check_service_location_attributes(service_locations_by_id_or_path, logger=None, log_debug: bool = True):
     """
-    Batch version over all service-location*.geojson in modules.config.DATA_DIR.
-    Returns rows with: 'Service Location ID', 'Attribute', 'Value', 'Issue'.
-    Ordering and logging match the single-file variant.
+    VALIDATION + ORDERING:
+    • Maintains deep-walk path order (then stable NAP grouping for unknowns).
+    • Returns rows with: 'Service Location ID', 'Attribute', 'Value', 'Issue'.
+
+    Rules:
+    - Build Type, Building Type, Drop Type, NAP Location: * must be exactly one of the allowed values; empty → Missing Attribute
+    - NAP #: * must be numeric (N or N.5), >= 1; empty → Missing Attribute
+    - Loose Tube: * must be one of 6 canonical colors; empty → Missing Attribute; else Misspelt Attribute
+    - Splice Colors: * must parse to 1–12 canonical colors; empty → Missing Attribute; else Misspelt Attribute on bad tokens
 
     NEW:
-    - Skips SLs whose Build Type is RSVD/Future unless enabled via
-      prefs 'include_rsvd_sl' / 'include_future_sl'.
+    - If Service Location 'Build Type' is RSVD or Future, skip unless enabled via:
+        modules.config.get_pref('include_rsvd_sl', False) / modules.config.get_pref('include_future_sl', False)
     """
-    import json, glob, re, logging
-    import modules.config
-    from modules.basic.log_configs import log_abbrev_header, log_issue_header
-    from modules.hard_scripts.distribution_walker import (
-        get_walk_order_index_map, get_walk_paths_map
-    )
-
-    logger = logging.getLogger(__name__)
+    logger = logger or logging.getLogger(__name__)
 
     detail    = str(getattr(modules.config, "LOG_DETAIL", "DEBUG")).upper()
     do_info   = (detail == "INFO" and log_debug)
     do_debug  = bool(log_debug and getattr(modules.config, "LOG_SVCLOC_DEBUG", False))
     show_path = bool(getattr(modules.config, "LOG_INCLUDE_WALK_PATH", False))
 
-    log_abbrev_header()
-
-    # Aggregate all SLs across files
+    # Load either dict or single file
     sl_props_by_id: dict[str, dict] = {}
-    for fn in glob.glob(f"{modules.config.DATA_DIR}/service-location*.geojson"):
+    if isinstance(service_locations_by_id_or_path, dict):
+        sl_props_by_id = service_locations_by_id_or_path
+    elif isinstance(service_locations_by_id_or_path, str):
+        src_path = service_locations_by_id_or_path
         try:
-            with open(fn, "r", encoding="utf-8") as f:
-                gj = json.load(f)
+            sl_props_by_id = _load_svcloc_props(src_path)
         except Exception as e:
-            logger.error(f"[SvcLoc] Failed to load {fn}: {e}")
-            continue
-        for feat in gj.get("features", []):
-            props = (feat.get("properties") or {}) if isinstance(feat, dict) else {}
-            sid = (props.get("Service Location ID") or props.get("ID") or props.get("vetro_id") or "").strip()
-            if sid:
-                sl_props_by_id[sid] = props
+            logger.error(f"[SvcLoc] Failed to load {src_path}: {e}")
+            return []
+    else:
+        logger.error(f"[SvcLoc] Unsupported input type: {type(service_locations_by_id_or_path)}")
+        return []
 
-    # Walker order & paths
-    order_map = get_walk_order_index_map()
-    try:
-        _paths = get_walk_paths_map()
-    except Exception:
-        _paths = {}
+    log_abbrev_header()
 
-    BIG = 10**9
+    return _run_svcloc_checks(sl_props_by_id, logger, do_info, do_debug, show_path)
 
-    def _extract_n(path_str: str) -> str:
-        if not path_str:
-            return ""
-        tokens = [t.strip() for t in path_str.split("→")]
-        for t in tokens:
-            if re.search(r"\bN\s*#?\s*\d+\b", t):
-                return t
-        return ""
 
-    def _nap_from_props(sid: str) -> str:
-        props = sl_props_by_id.get(sid) or {}
-        return str(props.get("NAP #") or props.get("NAP Number") or "").strip()
-
-    def _nap_numeric(nap_id: str) -> int:
-        if not nap_id:
-            return BIG
-        m = re.search(r"\bN\s*#?\s*(\d+)\b", nap_id, re.IGNORECASE)
-        if m:
-            return int(m.group(1))
-        if nap_id.isdigit():
-            return int(nap_id)
-        return BIG
-
-    def _nap_for_sid(sid: str) -> str:
-        return _extract_n(_paths.get(sid, "")) or _nap_from_props(sid)
-
-    def _sort_key(sid: str):
-        idx = order_map.get(sid)
-        if idx is not None:
-            return (0, idx, sid)
-        return (1, _nap_numeric(_nap_for_sid(sid)), sid)
-
-    ids = sorted(sl_props_by_id.keys(), key=_sort_key)
-    next_ordinal = (max(order_map.values()) if order_map else 0) + 1
+def check_all_service_location_attributes(log_debug: bool = True):
+    """
+    Batch version over all service-location*.geojson in modules.config.DATA_DIR.
+    Returns rows with: 'Service Location ID', 'Attribute', 'Value', 'Issue'.
+    Ordering and logging match the single-file variant.
 
-    rows: list[dict] = []
-    header_lines: list[str] = []
+    NEW:
+    - Skips SLs whose Build Type is RSVD/Future unless enabled via
+      prefs 'include_rsvd_sl' / 'include_future_sl'.
+    - Files are parsed in a thread pool unless modules.config.SVCLOC_PARALLEL_LOAD
+      is set to False.
+    - Files are merged in sorted path order, so when a Service Location ID
+      appears in more than one file the last file in sorted order wins
+      (deterministic, unlike the directory-listing order used before).
+    """
+    detail    = str(getattr(modules.config, "LOG_DETAIL", "DEBUG")).upper()
+    do_info   = (detail == "INFO" and log_debug)
+    do_debug  = bool(log_debug and getattr(modules.config, "LOG_SVCLOC_DEBUG", False))
+    show_path = bool(getattr(modules.config, "LOG_INCLUDE_WALK_PATH", False))
 
-    # NEW: inclusion toggles
-    _include_rsvd   = bool(modules.config.get_pref("include_rsvd_sl", False))
-    _include_future = bool(modules.config.get_pref("include_future_sl", False))
+    log_abbrev_header()
 
-    for sid in ids:
-        props = sl_props_by_id.get(sid) or {}
-        sl_num = order_map.get(sid)
-        if sl_num is None:
-            sl_num = next_ordinal
-            next_ordinal += 1
+    # Aggregate all SLs across files
+    sl_props_by_id: dict[str, dict] = {}
+    files = _svcloc_geojson_files("service-location*.geojson")
+    if getattr(modules.config, "SVCLOC_PARALLEL_LOAD", True) and len(files) > 1:
+        # Parse files concurrently; fold results on this thread in sorted path order
+        with ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1)) as ex:
+            loaded = list(ex.map(_try_load_svcloc_props, files))
+    else:
+        loaded = [_try_load_svcloc_props(fn) for fn in files]
 
-        # NEW: skip RSVD/Future by default (unless toggled ON in Settings)
-        bt = str(props.get("Build Type") or "").strip().lower()
-        if (bt == "rsvd" and not _include_rsvd) or (bt == "future" and not _include_future):
+    for fn, file_props, err in loaded:
+        if err is not None:
+            logger.error(f"[SvcLoc] Failed to load {fn}: {err}")
             continue
+        sl_props_by_id.update(file_props)
 
-        for attr, allowed in (
-            ("Build Type", _ALLOWED_BUILD_TYPE),
-            ("Building Type", _ALLOWED_BUILDING_TYPE),
-            ("Drop Type", _ALLOWED_DROP_TYPE),
-            ("NAP Location", _ALLOWED_NAP_LOCATION),
-        ):
-            res = _validate_dropdown(attr, props.get(attr), allowed)
-            if res:
-                rows.append({"Service Location ID": sid, **res})
-
-        res = _validate_nap_number(props.get("NAP #"))
-        if res:
-            rows.append({"Service Location ID": sid, **res})
-
-        res = _validate_loose_tube(props.get("Loose Tube"))
-        if res:
-            rows.append({"Service Location ID": sid, **res})
-
-        res = _validate_splice_colors(props.get("Splice Colors"))
-        if res:
-            rows.append({"Service Location ID": sid, **res})
-
-        if do_info:
-            path_part = f" — path={_paths[sid]}" if (show_path and _paths.get(sid)) else ""
-            if any(r["Service Location ID"] == sid for r in rows):
-                kinds = ", ".join(sorted({r["Issue"] for r in rows if r["Service Location ID"] == sid}))
-                logger.info(f"[Check Service Location Attributes] ❌ SL # {sl_num}: {sid} — {kinds}{path_part}")
-                header_lines.append(f"SL # {sl_num}: {sid} — {kinds}{path_part}")
-            else:
-                logger.info(f"[Check Service Location Attributes] ✅ SL # {sl_num}: {sid}{path_part}")
-
-    if header_lines:
-        log_issue_header("[Check Service Location Attributes] Attribute Problems", header_lines, logger=logger)
-
-    if do_debug:
-        logger.debug(f"• [SvcLoc] Total SL attribute rows (incl. spelling/choice/number): {len(rows)}")
-    return rows
\ No newline at end of file
+    return _run_svcloc_checks(sl_props_by_id, logger, do_info, do_debug, show_path)
@@ -1,49 +1,201 @@
 # modules/simple_scripts/slack_loops.py
 
-import glob
-import json
+import os
 import re
+from functools import lru_cache
+from typing import Iterator, NamedTuple
+from math import cos, pi, radians
+import numpy as np
 import modules.config
-from modules.basic.distance_utils import haversine, THRESHOLD_M
+from modules.basic.distance_utils import THRESHOLD_M
+from modules.basic.geojson_io import data_files, is_streamed, iter_features
+from modules.simple_scripts import _numeric
 from modules.simple_scripts.distribution import _load_underground_distributions
 from modules.simple_scripts.fiber_drop import load_fiber_drops
 
 
+# ───────────────────────── proximity grid ─────────────────────────
+# Hash grid of square lat/lon cells. The cell edge is THRESHOLD_M expressed in
+# degrees with a slightly short metres-per-degree, so a cell is never smaller
+# than THRESHOLD_M north-south; east-west the query widens by 1/cos(lat).
+_CELL_DEG = THRESHOLD_M / 111_000.0
+
+
+# Proximity gates use an equirectangular distance: at THRESHOLD_M range it
+# agrees with haversine() to far below a millimetre, without the trig.
+_M_PER_DEG = 6371000 * pi / 180          # same sphere as haversine()
+_THRESHOLD_M2 = THRESHOLD_M * THRESHOLD_M
+
+
+def _cell(lat: float, lon: float) -> tuple[int, int]:
+    return (int(lat // _CELL_DEG), int(lon // _CELL_DEG))
+
+
+def _grid_query(grid: dict, lat: float, lon: float):
+    """Yield every bucket entry whose cell overlaps the THRESHOLD_M box around (lat, lon)."""
+    dlon = _CELL_DEG / max(cos(radians(lat)), 1e-6)
+    for i in range(int((lat - _CELL_DEG) // _CELL_DEG), int((lat + _CELL_DEG) // _CELL_DEG) + 1):
+        for j in range(int((lon - dlon) // _CELL_DEG), int((lon + dlon) // _CELL_DEG) + 1):
+            bucket = grid.get((i, j))
+            if bucket:
+                yield from bucket
+
+
+def _point_grid(points) -> dict[tuple[int, int], list[int]]:
+    """Bucket the indices of points [(lat, lon, ...), ...] by grid cell."""
+    grid: dict[tuple[int, int], list[int]] = {}
+    for i, pt in enumerate(points):
+        grid.setdefault(_cell(pt[0], pt[1]), []).append(i)
+    return grid
+
+
+def _near_pairs(query_pts, pts_arr: np.ndarray, grid: dict | None = None) -> tuple[np.ndarray, np.ndarray]:
+    """
+    (qi, pj) index arrays of every query point / point pair within THRESHOLD_M,
+    grouped by query. pts_arr is (N, 2) lat/lon. With numba installed the
+    compiled _numeric kernel does the whole search; otherwise the grid (built
+    from pts_arr when not given) picks the candidate pairs and all of them are
+    measured in one vectorized pass.
+    """
+    if _numeric.AVAILABLE:
+        q_arr = np.asarray(query_pts, dtype=float).reshape(-1, 2)
+        return _numeric.pairs_within(q_arr, pts_arr, _CELL_DEG, _M_PER_DEG, _THRESHOLD_M2)
+    if grid is None:
+        grid = _point_grid(pts_arr.tolist())
+    qi: list[int] = []
+    pj: list[int] = []
+    for q, (lat, lon) in enumerate(query_pts):
+        for j in _grid_query(grid, lat, lon):
+            qi.append(q)
+            pj.append(j)
+    if not qi:
+        empty = np.empty(0, dtype=np.intp)
+        return empty, empty
+    qi_arr = np.asarray(qi, dtype=np.intp)
+    pj_arr = np.asarray(pj, dtype=np.intp)
+    q_arr = np.asarray(query_pts, dtype=float)[qi_arr]
+    p_arr = pts_arr[pj_arr]
+    dy = (p_arr[:, 0] - q_arr[:, 0]) * _M_PER_DEG
+    dx = (p_arr[:, 1] - q_arr[:, 1]) * _M_PER_DEG * np.cos(np.radians(q_arr[:, 0]))
+    hit = dx * dx + dy * dy <= _THRESHOLD_M2
+    return qi_arr[hit], pj_arr[hit]
+
+
+def _latlon_array(points) -> np.ndarray:
+    """(N, 2) float array of the leading (lat, lon) of each point."""
+    return np.asarray([(p[0], p[1]) for p in points], dtype=float).reshape(-1, 2)
+
+
+def _near_mask(query_pts, points) -> np.ndarray:
+    """Boolean array: for each (lat, lon) in query_pts, is any of points within THRESHOLD_M?"""
+    mask = np.zeros(len(query_pts), dtype=bool)
+    qi, _ = _near_pairs(query_pts, _latlon_array(points))
+    mask[qi] = True
+    return mask
+
+
+@lru_cache(maxsize=4)
+def _underground_vertex_index(files_key: tuple) -> tuple[list, np.ndarray, np.ndarray, dict]:
+    """
+    Every underground distribution vertex, ready for _near_pairs:
+      (dist_ids, verts, vert_dist, grid)
+    verts is (V, 2) lat/lon, vert_dist[v] indexes dist_ids, and grid maps a cell
+    to vertex indices (None when the numba kernel makes it unnecessary).
+    files_key is the (path, mtime) of every source file, so edits invalidate
+    the cache.
+    """
+    dist_map = _load_underground_distributions()
+    dist_ids = list(dist_map)
+    verts: list[tuple[float, float]] = []
+    vert_dist: list[int] = []
+    grid: dict[tuple[int, int], list[int]] = {}
+    for d, dist_id in enumerate(dist_ids):
+        for seg in dist_map[dist_id]:
+            for lon, lat in seg:
+                grid.setdefault(_cell(lat, lon), []).append(len(verts))
+                verts.append((lat, lon))
+                vert_dist.append(d)
+    return (dist_ids, np.asarray(verts, dtype=float).reshape(-1, 2),
+            np.asarray(vert_dist, dtype=np.intp), None if _numeric.AVAILABLE else grid)
+
+
+def _files_key(pattern: str) -> tuple:
+    """(path, mtime) of every DATA_DIR file matching pattern; a cache key that changes on edit."""
+    files = sorted(data_files(pattern))
+    return tuple((fn, os.path.getmtime(fn)) for fn in files)
+
+
+def _iter_props_geoms(fn: str):
+    """Yield (properties, geometry) for every GeoJSON Feature in one file."""
+    for feat in iter_features(fn):
+        try:
+            pair = (feat['properties'] or {}, feat['geometry'] or {})
+        except (KeyError, TypeError):
+            continue  # not a GeoJSON Feature
+        yield pair
+
+
+@lru_cache(maxsize=16)
+def _load_geojson_features(fn: str, mtime: float) -> tuple[tuple[dict, dict], ...]:
+    """
+    Parsed (properties, geometry) pairs for one GeoJSON file. mtime is part of
+    the cache key so an edited file is re-read; the cache only holds the
+    handful of layer files a run reads, so stale mtimes age out. Callers must
+    not mutate the returned dicts.
+    """
+    return tuple(_iter_props_geoms(fn))
+
+
+def _features(pattern: str):
+    """Yield (properties, geometry) for every feature in DATA_DIR files matching pattern."""
+    for fn in data_files(pattern):
+        if is_streamed(fn):
+            # Too big to pin in the cache; stream it every time
+            yield from _iter_props_geoms(fn)
+        else:
+            yield from _load_geojson_features(fn, os.path.getmtime(fn))
+
+
+@lru_cache(maxsize=4096)
+def _base_id(s: str) -> str:
+    """Compare on canonical ID: strip anything after the first ' / '."""
+    return (s or "").split(" / ", 1)[0].strip()
+
+
 def load_slack_loops_with_labels():
     """
-    Return list of (slack_vid, parent_vetro_id, fiber_label) tuples.
+    Return list of (slack_vid, parent_vetro_id, fiber_label, fiber_base_id) tuples.
     """
     out = []
-    for fn in glob.glob(f'{modules.config.DATA_DIR}/*slack-loop*.geojson'):
-        with open(fn, encoding='utf-8') as f:
-            gj = json.load(f)
-        for feat in gj.get('features', []):
-            props       = feat.get('properties', {})
-            slack_vid   = props.get('vetro_id')
-            parent_vid  = props.get('parent_vetro_id')
-            fiber_lbl   = props.get('Fiber Label')
-            if slack_vid and parent_vid and fiber_lbl:
-                out.append((slack_vid, parent_vid, fiber_lbl))
+    for props, _geom in _features('*slack-loop*.geojson'):
+        slack_vid   = props.get('vetro_id')
+        parent_vid  = props.get('parent_vetro_id')
+        fiber_lbl   = props.get('Fiber Label')
+        if slack_vid and parent_vid and fiber_lbl:
+            out.append((slack_vid, parent_vid, fiber_lbl, _base_id(fiber_lbl)))
     return out
 
+@lru_cache(maxsize=4)
+def _distribution_labels(files_key: tuple) -> dict[str, str]:
+    """load_distribution_labels() body, cached on the distribution files' (path, mtime)."""
+    mapping = {}
+    for kind in ('fiber-distribution-aerial', 'fiber-distribution-underground'):
+        for props, _geom in _features(f'*{kind}*.geojson'):
+            vid     = props.get('vetro_id')
+            raw_id  = props.get('ID', '')
+            if vid and raw_id:
+                # drop any suffix after a slash
+                base_id = raw_id.split('/', 1)[0].strip()
+                mapping[vid] = base_id
+    return mapping
+
+
 def load_distribution_labels():
     """
     Return dict: parent_vetro_id → distribution ID.
+    IDs are cut at the first '/', so they are already in _base_id() form.
     """
-    mapping = {}
-    for kind in ('fiber-distribution-aerial', 'fiber-distribution-underground'):
-        for fn in glob.glob(f'{modules.config.DATA_DIR}/*{kind}*.geojson'):
-            with open(fn, encoding='utf-8') as f:
-                gj = json.load(f)
-            for feat in gj.get('features', []):
-                props   = feat.get('properties', {})
-                vid     = props.get('vetro_id')
-                raw_id  = props.get('ID', '')
-                if vid and raw_id:
-                    # drop any suffix after a slash
-                    base_id = raw_id.split('/', 1)[0].strip()
-                    mapping[vid] = base_id
-    return mapping
+    return dict(_distribution_labels(_files_key('*fiber-distribution-*.geojson')))
 
 
 def find_slack_dist_mismatches():
@@ -54,17 +206,13 @@ def find_slack_dist_mismatches():
 
     Returns list of (slack_vid, fiber_label, dist_ID, issue) for mismatches.
     """
-    def base_id(s: str) -> str:
-        # Strip anything after the first " / " to compare on the canonical ID
-        return (s or "").split(" / ", 1)[0].strip()
-
-    slack = load_slack_loops_with_labels()  # (slack_vid, parent_vetro_id, fiber_lbl)
-    dist  = load_distribution_labels()      # parent_vetro_id -> base distribution ID
+    slack = load_slack_loops_with_labels()  # (slack_vid, parent_vetro_id, fiber_lbl, fiber_base)
+    dist  = _distribution_labels(_files_key('*fiber-distribution-*.geojson'))  # parent_vetro_id -> base distribution ID
 
     mismatches = []
-    for slack_vid, parent_vid, fiber_lbl in slack:
+    for slack_vid, parent_vid, fiber_lbl, fiber_base in slack:
         dist_id = dist.get(parent_vid, "")
-        if base_id(fiber_lbl) != base_id(dist_id):
+        if fiber_base != dist_id:
             mismatches.append(
                 (slack_vid, fiber_lbl, dist_id or "", "Slack fiber label doesn't match parent distribution")
             )
@@ -72,6 +220,53 @@ def find_slack_dist_mismatches():
     return mismatches
 
 
+class SlackPoints(NamedTuple):
+    """
+    Located slack loops as parallel columns; index i is the same slack in every
+    field, in file order.
+    """
+    coords: np.ndarray                   # (N, 2) float64 lat/lon
+    vids: tuple[str, ...]
+    parent_vids: tuple                   # parent_vetro_id as stored (may be None)
+    raw_fiber_labels: tuple              # 'Fiber Label' as stored (may be None)
+    fiber_labels: tuple[str, ...]        # stripped, '' when missing
+    slack_labels: tuple[str, ...]        # 'Slack Loop', stripped, '' when missing
+
+
+@lru_cache(maxsize=4)
+def _load_slack_points(files_key: tuple) -> SlackPoints:
+    """
+    One pass over the slack-loop files for every slack with a vetro_id and
+    usable coords. files_key comes from _files_key('*slack-loop*.geojson').
+    """
+    coords, vids, parents, raw_fls, sls = [], [], [], [], []
+    for props, geom in _features('*slack-loop*.geojson'):
+        slack_vid = props.get('vetro_id')
+        # Only require an ID and usable [lon, lat] coords
+        if not slack_vid:
+            continue
+        try:
+            xy = geom['coordinates']
+            lon, lat = xy[0], xy[1]
+        except (KeyError, TypeError, IndexError):
+            continue
+
+        coords.append((lat, lon))
+        vids.append(slack_vid)
+        parents.append(props.get('parent_vetro_id'))
+        raw_fls.append(props.get('Fiber Label'))
+        sls.append((props.get('Slack Loop') or '').strip())
+    return SlackPoints(
+        coords=np.asarray(coords, dtype=np.float64).reshape(-1, 2),
+        vids=tuple(vids),
+        parent_vids=tuple(parents),
+        raw_fiber_labels=tuple(raw_fls),
+        # Accept missing/blank Fiber Label; normalize to empty string
+        fiber_labels=tuple((fl or '').strip() for fl in raw_fls),
+        slack_labels=tuple(sls),
+    )
+
+
 def _load_slack_loops_with_labels_and_coords():
     """
     Return list of (lat, lon, slack_vid, fiber_label, slack_loop_label).
@@ -79,31 +274,32 @@ def _load_slack_loops_with_labels_and_coords():
     IMPORTANT: Do NOT require 'Fiber Label' to exist.
     Tail-End logic only needs the Slack Loop's vetro_id + 'Slack Loop' text + coords.
     """
-    out = []
-    for fn in glob.glob(f'{modules.config.DATA_DIR}/*slack-loop*.geojson'):
-        with open(fn, encoding='utf-8') as f:
-            gj = json.load(f)
-
-        for feat in gj.get('features', []):
-            props = (feat.get('properties') or {})
-            slack_vid = props.get('vetro_id')
-            # Accept missing/blank Fiber Label; normalize to empty string
-            fl = (props.get('Fiber Label') or '').strip()
-            sl = (props.get('Slack Loop') or '').strip()
-
-            geom = (feat.get('geometry') or {})
-            coords = (geom.get('coordinates') or [])
-
-            # Only require an ID and usable [lon, lat] coords
-            if not slack_vid or len(coords) < 2:
-                continue
+    sp = _load_slack_points(_files_key('*slack-loop*.geojson'))
+    return [(lat, lon, vid, fl, sl)
+            for (lat, lon), vid, fl, sl in zip(sp.coords.tolist(), sp.vids, sp.fiber_labels, sp.slack_labels)]
 
-            lon, lat = coords[0], coords[1]
-            out.append((lat, lon, slack_vid, fl, sl))
-    return out
 
+# Vault/NAP sizes that anchor an underground slack-loop check
+_ALLOWED_ANCHOR_SIZES = frozenset({"DV", "LDV", "LDV Traffic Rated", "T1 Concrete", "T2 Concrete"})
+
+
+@lru_cache(maxsize=8)
+def _size_by_coord(pattern: str, files_key: tuple) -> dict[tuple[float, float], str | None]:
+    """{(lat, lon) rounded to 6: 'Size'} for the point features matching pattern, in one pass."""
+    return {
+        (round(c[1], 6), round(c[0], 6)): props.get('Size')
+        for props, geom in _features(pattern)
+        for c in (geom['coordinates'],)
+    }
 
-def find_underground_slack_mismatches(nap_coords, vault_coords, vault_map):
+
+@lru_cache(maxsize=1024)
+def _sorted_join(ids: frozenset[str]) -> str:
+    """' / '-joined sorted IDs; neighbouring anchors often share the same set."""
+    return " / ".join(sorted(ids))
+
+
+def find_underground_slack_mismatches(nap_coords, vault_coords, vault_map) -> Iterator[tuple]:
     """
     For each allowed Vault/NAP anchor:
       1) Gather *all* underground Distribution IDs that physically touch it.
@@ -114,138 +310,116 @@ def find_underground_slack_mismatches(nap_coords, vault_coords, vault_map):
            where parent Distribution ID is looked up from slack-loop.parent_vetro_id.
       4) For every allowed Vault, also flag if there is NO slack loop present at all.
 
-    Returns rows shaped for Excel:
+    Yields rows shaped for Excel (wrap in list() when the rows are needed more than once):
       (joined_touching_ids, "underground",
        joined_fiber_labels, joined_slack_labels, joined_slack_vids,
        vault_vetro_id, issue)
     """
 
-    # ——— helpers ———
-    def base_id(s: str) -> str:
-        """Compare on canonical ID: strip anything after the first ' / '."""
-        return (s or "").split(" / ", 1)[0].strip()
-
-    def seg_touches_point(seg, pt_lat, pt_lon) -> bool:
-        for lon, lat in seg:
-            if haversine(pt_lat, pt_lon, lat, lon) <= THRESHOLD_M:
-                return True
-        return False
-
     # 0) Data prep
-    dist_map  = _load_underground_distributions()                 # {dist_id: [segments]}
-    slack_pts = _load_slack_loops_with_labels_and_coords()        # [(lat, lon, slack_vid, fiber_label, slack_loop_label)]
-    slack_parent_rows = load_slack_loops_with_labels()            # [(slack_vid, parent_vetro_id, fiber_label)]
-    parent_by_slack = {vid: parent for vid, parent, _ in slack_parent_rows}
+    dist_ids, verts, vert_dist, vert_grid = _underground_vertex_index(_files_key('*fiber-distribution-underground*.geojson'))
+    slack = _load_slack_points(_files_key('*slack-loop*.geojson'))
+    slack_fiber_base = [_base_id(fl) if fl else "" for fl in slack.fiber_labels]  # aligned with slack
 
     # Map parent_vetro_id -> distribution ID (already normalized to base ID in loader)
-    dist_id_by_parent_vid = load_distribution_labels()            # {parent_vetro_id: base_dist_id}
+    dist_id_by_parent_vid = _distribution_labels(_files_key('*fiber-distribution-*.geojson'))  # {parent_vetro_id: base_dist_id}
+    # Flatten slack vetro_id -> parent Distribution base ID once, so each slack at an
+    # anchor is a single lookup. Parent linkage only for slacks carrying a Fiber Label,
+    # as load_slack_loops_with_labels() does; slacks without a resolvable parent are left out.
+    parent_by_slack = {vid: parent for vid, parent, fl in zip(slack.vids, slack.parent_vids, slack.raw_fiber_labels)
+                       if parent and fl}
+    parent_base_by_vid = {vid: base for vid, parent in parent_by_slack.items()
+                          if (base := dist_id_by_parent_vid.get(parent, ""))}
 
     # 1) Filter allowed Vaults/NAPs by Size (unchanged from your version)
-    vault_features = []
-    for fn in glob.glob(f"{modules.config.DATA_DIR}/*vault*.geojson"):
-        gj = json.load(open(fn, encoding="utf-8"))
-        vault_features.extend(gj.get('features', []))
-    vault_size_map = {
-        (round(feat['geometry']['coordinates'][1], 6),
-         round(feat['geometry']['coordinates'][0], 6)): (feat.get('properties', {}) or {}).get('Size')
-        for feat in vault_features
+    #    Anchors are keyed on 6-decimal coords, so the same point recorded twice is scanned once
+    vault_size_map = _size_by_coord("*vault*.geojson", _files_key("*vault*.geojson"))
+    vault_set = {
+        key for coord in vault_coords
+        if vault_size_map.get(key := (round(coord[0], 6), round(coord[1], 6))) in _ALLOWED_ANCHOR_SIZES
     }
-    ALLOWED_SIZES = {"DV", "LDV", "LDV Traffic Rated", "T1 Concrete", "T2 Concrete"}
-    filtered_vault_coords = [
-        coord for coord in vault_coords
-        if vault_size_map.get((round(coord[0], 6), round(coord[1], 6))) in ALLOWED_SIZES
-    ]
-
-    nap_features = []
-    for fn in glob.glob(f"{modules.config.DATA_DIR}/*nap*.geojson"):
-        gj = json.load(open(fn, encoding="utf-8"))
-        nap_features.extend(gj.get('features', []))
-    nap_size_map = {
-        (round(feat['geometry']['coordinates'][1], 6),
-         round(feat['geometry']['coordinates'][0], 6)): (feat.get('properties', {}) or {}).get('Size')
-        for feat in nap_features
-    }
-    filtered_nap_coords = [
-        coord for coord in nap_coords
-        if nap_size_map.get((round(coord[0], 6), round(coord[1], 6))) in ALLOWED_SIZES
-    ]
-
-    anchor_pts = set(filtered_vault_coords + filtered_nap_coords)
-
-    issues = []
 
-    # 2) Walk each anchor and compare
-    for pt_lat, pt_lon in anchor_pts:
-        # A) All underground Distribution IDs that touch this anchor
-        touching_ids = set()
-        for dist_id, segments in dist_map.items():
-            if any(seg_touches_point(seg, pt_lat, pt_lon) for seg in segments):
-                touching_ids.add(dist_id)
+    nap_size_map = _size_by_coord("*nap*.geojson", _files_key("*nap*.geojson"))
+    nap_set = {
+        key for coord in nap_coords
+        if nap_size_map.get(key := (round(coord[0], 6), round(coord[1], 6))) in _ALLOWED_ANCHOR_SIZES
+    }
 
-        if not touching_ids:
+    anchor_pts = list(vault_set | nap_set)
+
+    # 2) Proximity for all anchors in one vectorized pass each:
+    #    A) underground distributions touching the anchor (any vertex within THRESHOLD_M)
+    touching_by_anchor: list[set[int]] = [set() for _ in anchor_pts]
+    ai, vj = _near_pairs(anchor_pts, verts, vert_grid)
+    for a, d in zip(ai.tolist(), vert_dist[vj].tolist()):
+        touching_by_anchor[a].add(d)
+
+    #    B) slack loops at anchors that have a touching distribution
+    touched = [a for a, ds in enumerate(touching_by_anchor) if ds]
+    slack_by_anchor: dict[int, list[int]] = {a: [] for a in touched}
+    si, sj = _near_pairs([anchor_pts[a] for a in touched], slack.coords)
+    for k, j in zip(si.tolist(), sj.tolist()):
+        slack_by_anchor[touched[k]].append(j)
+
+    # 3) Walk each anchor and compare
+    for a, anchor_key in enumerate(anchor_pts):           # anchor_key is the rounded (lat, lon)
+        touching = touching_by_anchor[a]
+        if not touching:
             # No underground DF at this anchor → nothing to compare
             continue
 
-        touching_base = {base_id(x) for x in touching_ids}
-
-        # B) Collect Slack Loops at this anchor
+        # Slack Loops at this anchor, in file order
         fiber_labels, slack_labels, slack_vids = [], [], []
-        for sl_lat, sl_lon, slack_vid, fiber_lbl, slack_loop_label in slack_pts:
-            if haversine(pt_lat, pt_lon, sl_lat, sl_lon) <= THRESHOLD_M:
-                fiber_labels.append(fiber_lbl)
-                slack_labels.append(slack_loop_label)
-                slack_vids.append(slack_vid)
+        fiber_base = set()
+        for i in sorted(slack_by_anchor[a]):
+            slack_vid, fiber_lbl, slack_loop_label = slack.vids[i], slack.fiber_labels[i], slack.slack_labels[i]
+            fiber_labels.append(fiber_lbl)
+            slack_labels.append(slack_loop_label)
+            slack_vids.append(slack_vid)
+            if fiber_lbl:
+                fiber_base.add(slack_fiber_base[i])
 
-        is_vault = (pt_lat, pt_lon) in filtered_vault_coords
+        is_vault = anchor_key in vault_set
 
         # If vault has no slack loops at all – always flag (existing behavior)
         if is_vault and not fiber_labels and not slack_labels:
-            issues.append((
-                " / ".join(sorted(touching_ids)),
+            yield (
+                _sorted_join(frozenset(dist_ids[d] for d in touching)),
                 "underground",
                 "", "", "",                                   # no fiber/slack info present
-                vault_map.get((round(pt_lat, 6), round(pt_lon, 6)), ""),
+                vault_map.get(anchor_key, ""),
                 "No slack loop present at allowed Vault/NAP anchor"
-            ))
+            )
             continue
 
-        # C) Build overlap sets TWO ways:
-        #    1) By the *Fiber Label* written on the slack
-        fiber_base = {base_id(fl) for fl in fiber_labels if fl}
+        # C) Build the acceptable base IDs TWO ways:
+        #    1) By the *Fiber Label* written on the slack (fiber_base, gathered above)
 
         #    2) By the parent_vetro_id → parent Distribution ID
         #       (only for slack loops physically at this point)
-        parent_base = set()
-        for vid in slack_vids:
-            parent_vid = parent_by_slack.get(vid, "")
-            parent_dist_id = dist_id_by_parent_vid.get(parent_vid, "")
-            if parent_dist_id:
-                parent_base.add(base_id(parent_dist_id))
-
-        overlap_by_fiber  = touching_base & fiber_base
-        overlap_by_parent = touching_base & parent_base
-
-        # D) If EITHER overlap is non-empty, it's a match → no issue.
-        if overlap_by_fiber or overlap_by_parent:
+        slack_base = fiber_base
+        slack_base.update(parent_base_by_vid[v] for v in slack_vids if v in parent_base_by_vid)
+
+        # D) If ANY touching Distribution's base ID is in either set, it's a match → no issue.
+        #    Stops at the first hit; the full touching set is only materialized for a row.
+        if slack_base and any(_base_id(dist_ids[d]) in slack_base for d in touching):
             continue
 
         # Otherwise, flag a mismatch row for this anchor
-        issues.append((
-            " / ".join(sorted(touching_ids)),
+        yield (
+            _sorted_join(frozenset(dist_ids[d] for d in touching)),
             "underground",
             " / ".join(sorted(fiber_labels)),
             " / ".join(sorted([s for s in slack_labels if s])),
             " / ".join(sorted(slack_vids)),
-            vault_map.get((round(pt_lat, 6), round(pt_lon, 6)), ""),
+            vault_map.get(anchor_key, ""),
             "No matching slack at anchor for touching Distribution(s)"
-        ))
-
-    return issues
+        )
 
 
 def invalid_slack_loops(power_coords: list[tuple],
                         nap_coords: list[tuple],
-                        slack_coords: set[tuple]) -> list[tuple]:
+                        slack_coords: set[tuple]) -> Iterator[tuple]:
     """
     AERIAL RULE (updated):
 
@@ -258,36 +432,69 @@ def invalid_slack_loops(power_coords: list[tuple],
       - Drops on a pole WITHOUT a NAP and without a Slack Loop are acceptable.
       - Poles without any Drops are ignored.
 
-    Returns:
-      List[(lat, lon)] for poles that violate the rule. Coordinates are rounded to 6 decimals.
+    Yields:
+      (lat, lon) for each pole that violates the rule. Coordinates are rounded to 6 decimals.
     """
     try:
         drop_points = list(load_fiber_drops().keys())  # [(lat, lon), ...]
     except Exception:
         drop_points = []
 
-    issues: list[tuple] = []
-    for lat_p, lon_p in power_coords:
-        # Require a fiber drop to consider this pole
-        has_drop  = any(haversine(lat_p, lon_p, lat_d, lon_d) <= THRESHOLD_M
-                        for (lat_d, lon_d) in drop_points)
-        if not has_drop:
-            continue  # No drop => do not enforce slack
-
-        # New carve-out: Drop present but NO NAP => OK (do not flag)
-        has_nap   = any(haversine(lat_p, lon_p, lat_n, lon_n) <= THRESHOLD_M
-                        for (lat_n, lon_n) in nap_coords)
-        if not has_nap:
-            continue
+    nap_points = list(nap_coords)
+    slack_points = list(slack_coords)
+    poles = [(lat, lon) for lat, lon in power_coords]
 
-        # Drop + NAP present ⇒ Slack Loop is REQUIRED
-        has_slack = any(haversine(lat_p, lon_p, lat_s, lon_s) <= THRESHOLD_M
-                        for (lat_s, lon_s) in slack_coords)
+    # Each stage only measures the poles that survived the previous one.
+    # Require a fiber drop to consider this pole
+    has_drop = _near_mask(poles, drop_points)
+    cand = [p for p, ok in zip(poles, has_drop) if ok]   # No drop => do not enforce slack
 
-        if not has_slack:
-            issues.append((round(lat_p, 6), round(lon_p, 6)))
+    # New carve-out: Drop present but NO NAP => OK (do not flag)
+    has_nap = _near_mask(cand, nap_points)
+    cand = [p for p, ok in zip(cand, has_nap) if ok]
 
-    return issues
+    # Drop + NAP present ⇒ Slack Loop is REQUIRED
+    has_slack = _near_mask(cand, slack_points)
+
+    for (lat_p, lon_p), ok in zip(cand, has_slack):
+        if not ok:
+            yield (round(lat_p, 6), round(lon_p, 6))
+
+
+@lru_cache(maxsize=4)
+def _distribution_lines(kind: str, files_key: tuple) -> tuple[dict[str, list[list[list[float]]]], dict[str, str]]:
+    """
+    kind: 'fiber-distribution-aerial' | 'fiber-distribution-underground'
+    Returns:
+      mapping:     dist_id -> [segments], each segment is a list of [lon, lat]
+      vetro_map:   dist_id -> vetro_id (from properties 'vetro_id' or 'Vetro ID' if present)
+    Cached on files_key (path, mtime); callers must not mutate the result.
+    """
+    mapping: dict[str, list[list[list[float]]]] = {}
+    vetro_map: dict[str, str] = {}
+    for props, geom in _features(f"*{kind}*.geojson"):
+        dist_id = props.get("ID")
+        dist_vetro = props.get("vetro_id") or props.get("Vetro ID") or props.get("vetroid") or ""
+        try:
+            typ = geom["type"]
+            coords = geom["coordinates"]
+        except KeyError:
+            continue
+        if not dist_id or not coords:
+            continue
+        if typ == "LineString":
+            mapping.setdefault(dist_id, []).append(coords)
+        elif typ == "MultiLineString":
+            for seg in coords:
+                mapping.setdefault(dist_id, []).append(seg)
+        # Keep first seen vetro_id if present
+        if dist_id and dist_vetro and dist_id not in vetro_map:
+            vetro_map[dist_id] = dist_vetro
+    return mapping, vetro_map
+
+
+# Leading footage of a slack label ("30' Tail" → 30); anything after the digits is irrelevant.
+_TAIL_FOOTAGE_RE = re.compile(r"(\d+)")
 
 
 def find_distribution_end_tail_issues() -> list[tuple[str, str, str, str, str]]:
@@ -314,16 +521,29 @@ def find_distribution_end_tail_issues() -> list[tuple[str, str, str, str, str]]:
     global _LAST_TAIL_END_DIST_IDS
     _LAST_TAIL_END_DIST_IDS = []
 
-    # --- Load all Slack Loops once: (lat, lon, vetro_id, fiber_label, slack_loop_label)
-    slack_pts: list[tuple[float, float, str, str, str]] = _load_slack_loops_with_labels_and_coords()
+    # --- Load all Slack Loops once (columns: coords, vids, slack_labels, ...)
+    slack = _load_slack_points(_files_key('*slack-loop*.geojson'))
+    # Slacks already labelled "Tail" (case-insensitive): one of these near an end settles it
+    tail_arr = slack.coords[[i for i, lbl in enumerate(slack.slack_labels) if "tail" in lbl.lower()]]
 
-    def nearby_slacks(lat_e: float, lon_e: float) -> list[tuple[str, str]]:
-        """Return [(vetro_id, slack_loop_label)] within THRESHOLD_M of endpoint."""
-        hits: list[tuple[str, str]] = []
-        for sl_lat, sl_lon, sl_vid, _fiber_lbl, sl_label in slack_pts:
-            if haversine(lat_e, lon_e, sl_lat, sl_lon) <= THRESHOLD_M:
-                hits.append((sl_vid or "", (sl_label or "").strip()))
-        return hits
+    def nearby_slacks(ends: list[tuple[float, float]]) -> list[list[tuple[str, str]] | None]:
+        """
+        For each endpoint: None when a "Tail" slack is within THRESHOLD_M, else the
+        [(vetro_id, slack_loop_label)] of every slack within THRESHOLD_M (file order).
+        All endpoints are measured in one vectorized pass per slack set.
+        """
+        ti, _ = _near_pairs(ends, tail_arr)
+        has_tail = np.zeros(len(ends), dtype=bool)
+        has_tail[ti] = True
+        need = np.flatnonzero(~has_tail).tolist()
+        out: list[list[tuple[str, str]] | None] = [None] * len(ends)
+        for k in need:
+            out[k] = []
+        qi, sj = _near_pairs([ends[k] for k in need], slack.coords)
+        for q, j in sorted(zip(qi.tolist(), sj.tolist())):
+            sl_vid, sl_label = slack.vids[j], slack.slack_labels[j]
+            out[need[q]].append((sl_vid or "", (sl_label or "").strip()))
+        return out
 
     def _expected_from_label(label: str) -> str:
         """Pull the leading footage (e.g., 30, 60, 70, 90) from the *found* label and express expectation as "' Tail".
@@ -331,80 +551,52 @@ def find_distribution_end_tail_issues() -> list[tuple[str, str, str, str, str]]:
         """
         if not label:
             return "Tail"
-        m = re.search(r"(\d+)\s*'?\s*", label)
-        if m:
-            return f"{m.group(1)}' Tail"
-        return "Tail"
+        m = _TAIL_FOOTAGE_RE.search(label)
+        return f"{m.group(1)}' Tail" if m else "Tail"
 
     def _load_dist(kind: str) -> tuple[dict[str, list[list[list[float]]]], dict[str, str]]:
-        """
-        kind: 'fiber-distribution-aerial' | 'fiber-distribution-underground'
-        Returns:
-          mapping:     dist_id -> [segments], each segment is a list of [lon, lat]
-          vetro_map:   dist_id -> vetro_id (from properties 'vetro_id' or 'Vetro ID' if present)
-        """
-        mapping: dict[str, list[list[list[float]]]] = {}
-        vetro_map: dict[str, str] = {}
-        for fn in glob.glob(f"{modules.config.DATA_DIR}/*{kind}*.geojson"):
-            with open(fn, encoding="utf-8") as f:
-                gj = json.load(f)
-            for feat in gj.get("features", []):
-                props = feat.get("properties", {}) or {}
-                dist_id = props.get("ID")
-                dist_vetro = props.get("vetro_id") or props.get("Vetro ID") or props.get("vetroid") or ""
-                geom = feat.get("geometry", {}) or {}
-                typ = geom.get("type")
-                coords = geom.get("coordinates", []) or []
-                if not dist_id or not coords:
-                    continue
-                if typ == "LineString":
-                    mapping.setdefault(dist_id, []).append(coords)
-                elif typ == "MultiLineString":
-                    for seg in coords:
-                        mapping.setdefault(dist_id, []).append(seg)
-                # Keep first seen vetro_id if present
-                if dist_id and dist_vetro and dist_id not in vetro_map:
-                    vetro_map[dist_id] = dist_vetro
-        return mapping, vetro_map
+        """kind: 'fiber-distribution-aerial' | 'fiber-distribution-underground'; see _distribution_lines."""
+        return _distribution_lines(kind, _files_key(f"*{kind}*.geojson"))
 
     def _terminal_ends(segments: list[list[list[float]]]) -> list[tuple[float, float]]:
         """Compute terminal endpoints (points that appear once among segment endpoints)."""
-        from collections import Counter
-
-        def rnd(lat: float, lon: float) -> tuple[float, float]:
-            return (round(lat, 6), round(lon, 6))
-
-        counts = Counter()
+        seen: dict[tuple[float, float], None] = {}   # insertion-ordered set
+        dup: set[tuple[float, float]] = set()
         for seg in segments or []:
             if not seg:
                 continue
             first = seg[0]
             last = seg[-1]
-            counts[rnd(first[1], first[0])] += 1  # [lon, lat] -> (lat, lon)
-            counts[rnd(last[1], last[0])] += 1
-        return [pt for pt, c in counts.items() if c == 1]
+            for pt in ((round(first[1], 6), round(first[0], 6)),   # [lon, lat] -> (lat, lon)
+                       (round(last[1], 6), round(last[0], 6))):
+                if pt in seen:
+                    dup.add(pt)
+                else:
+                    seen[pt] = None
+        return [pt for pt in seen if pt not in dup]
 
     rows: list[tuple[str, str, str, str, str]] = []
 
     for kind, type_uc in (("fiber-distribution-aerial", "Aerial"), ("fiber-distribution-underground", "Underground")):
         dist_map, vetro_map = _load_dist(kind)
-        for _dist_id, segments in dist_map.items():
-            dist_vetro = vetro_map.get(_dist_id, "")
-            for lat_e, lon_e in _terminal_ends(segments):
-                hits = nearby_slacks(lat_e, lon_e)
-
-                # If any nearby slack has "Tail" anywhere in its label ⇒ OK
-                if any("tail" in (lbl.lower()) for _vid, lbl in hits if lbl):
-                    continue
-
-                # Otherwise, flag: one row per non-tail slack if present; else a single 'no slack' row
-                if hits:
-                    for vid, lbl in hits:
-                        expected = _expected_from_label(lbl)
-                        rows.append((vid, type_uc, lbl, expected, "Slack loop label missing 'Tail'"))
-                        _LAST_TAIL_END_DIST_IDS.append("")  # Dist ID column should stay blank for this issue
-                else:
-                    rows.append(("", type_uc, "", "Tail", "No slack loop near distribution end"))
-                    _LAST_TAIL_END_DIST_IDS.append(dist_vetro or "")
+        ends = [(dist_id, pt) for dist_id, segments in dist_map.items() for pt in _terminal_ends(segments)]
+        # Distributions meeting at one vault/NAP share an endpoint: measure each point once
+        unique_pts = list(dict.fromkeys(pt for _, pt in ends))
+        hits_by_pt = dict(zip(unique_pts, nearby_slacks(unique_pts)))
+        for _dist_id, pt in ends:
+            hits = hits_by_pt[pt]
+            # If any nearby slack has "Tail" anywhere in its label ⇒ OK
+            if hits is None:
+                continue
+
+            # Otherwise, flag: one row per non-tail slack if present; else a single 'no slack' row
+            if hits:
+                for vid, lbl in hits:
+                    expected = _expected_from_label(lbl)
+                    rows.append((vid, type_uc, lbl, expected, "Slack loop label missing 'Tail'"))
+                    _LAST_TAIL_END_DIST_IDS.append("")  # Dist ID column should stay blank for this issue
+            else:
+                rows.append(("", type_uc, "", "Tail", "No slack loop near distribution end"))
+                _LAST_TAIL_END_DIST_IDS.append(vetro_map.get(_dist_id, "") or "")
 
     return rows
\ No newline at end of file
@@ -16,16 +16,23 @@
 #   • All file I/O uses modules.config.DATA_DIR.
 #   • Proximity checks use THRESHOLD_M (≈ 3 ft).
 #   • Distances are geodesic (haversine) and converted to feet.
+#   • Vault/conduit proximity goes through a uniform lat/lon grid, so only
+#     nearby vault/edge pairs are ever measured.
 
 from __future__ import annotations
 
-import glob
-import json
-from typing import Dict, List, Tuple, Iterable
+import os
+from functools import lru_cache
+from math import cos, floor, radians
+from typing import Dict, List, NamedTuple, Tuple, Iterable
+
+import numpy as np
 
 import modules.config
+from modules.simple_scripts import _vault_kernels
 from modules.simple_scripts.geojson_loader import load_features
-from modules.basic.distance_utils import haversine, THRESHOLD_M, bearing
+from modules.basic.distance_utils import haversine, haversine_np, THRESHOLD_M, bearing_np
+from modules.basic.geojson_io import data_files, iter_features
 
 M_TO_FT = 3.28084
 
@@ -44,14 +51,14 @@ def _load_conduits() -> List[dict]:
       }
     """
     feats: List[dict] = []
-    for path in glob.glob(f"{modules.config.DATA_DIR}/*conduit*.geojson"):
+    for path in data_files("*conduit*.geojson"):
+        # An unreadable file is skipped as a whole
         try:
-            with open(path, "r", encoding="utf-8") as f:
-                gj = json.load(f)
+            features = list(iter_features(path))
         except Exception:
             continue
 
-        for feat in gj.get("features", []) or []:
+        for feat in features:
             props = (feat.get("properties") or {}) if isinstance(feat, dict) else {}
             geom  = (feat.get("geometry") or {}) if isinstance(feat, dict) else {}
             coords= geom.get("coordinates") or []
@@ -81,138 +88,271 @@ def _load_conduits() -> List[dict]:
     return feats
 
 
-def _collect_conduit_vertices(conduits: Iterable[dict]) -> List[Tuple[float,float]]:
-    verts: List[Tuple[float,float]] = []
-    for c in conduits:
-        for seg in c.get("segments", []):
-            verts.extend(seg)
-    return verts
+def _conduit_files_key() -> tuple:
+    """(path, mtime) of every *conduit*.geojson; a cache key that changes on edit."""
+    paths = sorted(data_files("*conduit*.geojson"))
+    return tuple((p, os.path.getmtime(p)) for p in paths)
 
 
-def _polyline_length_m(seg: List[Tuple[float,float]]) -> float:
-    if not seg or len(seg) < 2:
-        return 0.0
-    dist = 0.0
-    for i in range(1, len(seg)):
-        a = seg[i-1]; b = seg[i]
-        dist += haversine(a[0], a[1], b[0], b[1])
-    return dist
+# -----------------------------
+# Grid index
+# -----------------------------
+# Square lat/lon cells (~110 m). Boxes are filed under every cell they overlap;
+# a query collects the boxes in the cells around a point padded by the
+# tolerance, and the exact distance test runs on those candidates only.
+# An edge whose box covers more than _MAX_EDGE_CELLS cells (a stray vertex,
+# swapped lat/lon) is not filed at all; it is checked against every query
+# instead, so one bad vertex cannot blow up the index.
+_CELL_DEG = 0.001
+_MAX_EDGE_CELLS = 256
 
 
-def _closest_vertex_index(seg: List[Tuple[float,float]], pt: Tuple[float,float]) -> int:
-    """Return index of vertex in seg that is closest (by haversine) to pt."""
-    lat, lon = pt
-    best_i, best_d = 0, float("inf")
-    for i, (slat, slon) in enumerate(seg):
-        d = haversine(lat, lon, slat, slon)
-        if d < best_d:
-            best_d, best_i = d, i
-    return best_i
+def _cell_range(lo: float, hi: float) -> range:
+    return range(floor(lo / _CELL_DEG), floor(hi / _CELL_DEG) + 1)
 
 
-def _distance_along(seg: List[Tuple[float,float]], i0: int, i1: int) -> float:
-    """Path distance (meters) along seg from vertex i0 to i1 (inclusive)."""
-    if i0 == i1:
-        return 0.0
-    lo, hi = (i0, i1) if i0 <= i1 else (i1, i0)
-    # sum edges between lo..hi
-    dist = 0.0
-    for j in range(lo+1, hi+1):
-        a, b = seg[j-1], seg[j]
-        dist += haversine(a[0], a[1], b[0], b[1])
-    return dist
+def _grid_index(boxes: Iterable[Tuple[float, float, float, float]],
+                skip: Iterable[int] = ()) -> Dict[Tuple[int, int], List[int]]:
+    """
+    Bucket the indices of (min_lat, min_lon, max_lat, max_lon) boxes by every
+    cell they overlap; indices in skip are left out.
+    """
+    skip = set(skip)
+    grid: Dict[Tuple[int, int], List[int]] = {}
+    for k, (lat0, lon0, lat1, lon1) in enumerate(boxes):
+        if k in skip:
+            continue
+        for i in _cell_range(lat0, lat1):
+            for j in _cell_range(lon0, lon1):
+                grid.setdefault((i, j), []).append(k)
+    return grid
 
 
-def _angle_diff(a: float, b: float) -> float:
-    """Smallest absolute difference between two bearings (deg in [0,180])."""
-    d = abs((a - b + 180) % 360 - 180)
-    return d
+def _grid_candidates(grid: Dict[Tuple[int, int], List[int]], lat: float, lon: float, tol_m: float) -> List[int]:
+    """
+    Sorted indices of every box that may lie within tol_m of (lat, lon).
+    The east-west pad is widened by 1/cos(lat), plus slack because the distance
+    tests scale longitude at the mean latitude of all the points involved.
+    """
+    pad_lat = tol_m / 111000.0
+    pad_lon = 1.1 * pad_lat / max(cos(radians(lat)), 1e-6)
+    found = set()
+    for i in _cell_range(lat - pad_lat, lat + pad_lat):
+        for j in _cell_range(lon - pad_lon, lon + pad_lon):
+            found.update(grid.get((i, j), ()))
+    return sorted(found)
+
+
+class ConduitIndex(NamedTuple):
+    """
+    Every conduit edge as one flat table, in file order. Run s is a segment of
+    conduit run_conduit[s]; its edges are rows seg_start[s]:seg_start[s+1].
+    Lengths are geodesic meters, bearings degrees in [0, 360).
+    """
+    conduit_meta: List[Tuple[str, str]]       # (id, vetro_id) per conduit
+    run_conduit: np.ndarray                   # (S,) intp conduit of each run
+    seg_start: np.ndarray                     # (S+1,) intp
+    ends: np.ndarray                          # (E, 4) float64 alat, alon, blat, blon
+    bbox: np.ndarray                          # (E, 4) float64 min_lat, min_lon, max_lat, max_lon
+    edge_seg: np.ndarray                      # (E,) intp run of each edge
+    edge_len: np.ndarray                      # (E,) edge length
+    edge_bearing: np.ndarray                  # (E,) forward bearing a -> b
+    edge_cum0: np.ndarray                     # (E,) along-run distance to the edge start
+    run_len: np.ndarray                       # (S,) total run length
+    oversized: np.ndarray                     # (K,) intp edges kept out of the grid (see _MAX_EDGE_CELLS)
+    grid: Dict[Tuple[int, int], List[int]] | None  # edge ids by cell (see _grid_index); None with numba
+    cells: tuple | None                       # _vault_kernels.edge_cells table; None without numba
+
+
+@lru_cache(maxsize=4)
+def _conduit_edge_index(files_key: tuple) -> ConduitIndex:
+    """
+    ConduitIndex for the conduit files in files_key. Built once per set of file
+    mtimes and shared by all three checks, so the per-edge invariants (lengths,
+    along-run offsets) are computed once rather than per check or per vault.
+    """
+    conduits = _load_conduits()
+    run_conduit: List[int] = []
+    seg_start: List[int] = [0]
+    ends: List[Tuple[float, float, float, float]] = []
+    edge_seg: List[int] = []
+    for ci, c in enumerate(conduits):
+        for seg in c.get("segments", []):
+            for a, b in zip(seg, seg[1:]):
+                ends.append((a[0], a[1], b[0], b[1]))
+                edge_seg.append(len(run_conduit))
+            run_conduit.append(ci)
+            seg_start.append(len(ends))
+    ends_arr = np.asarray(ends, dtype=np.float64).reshape(-1, 4)
+    bbox = np.column_stack((
+        np.minimum(ends_arr[:, 0], ends_arr[:, 2]), np.minimum(ends_arr[:, 1], ends_arr[:, 3]),
+        np.maximum(ends_arr[:, 0], ends_arr[:, 2]), np.maximum(ends_arr[:, 1], ends_arr[:, 3]),
+    ))
+    n_cells = ((np.floor(bbox[:, 2] / _CELL_DEG) - np.floor(bbox[:, 0] / _CELL_DEG) + 1)
+               * (np.floor(bbox[:, 3] / _CELL_DEG) - np.floor(bbox[:, 1] / _CELL_DEG) + 1))
+    oversized = np.flatnonzero(n_cells > _MAX_EDGE_CELLS)
+    # The compiled kernels search their own cell table; the dict grid is only for the NumPy path
+    if _vault_kernels.AVAILABLE:
+        grid, cells = None, _vault_kernels.edge_cells(bbox, _CELL_DEG, oversized)
+    else:
+        grid, cells = _grid_index(bbox.tolist(), oversized.tolist()), None
+
+    # Geodesic edge lengths for every edge at once, then the along-run distance
+    # to each edge start and the total length of each run
+    edge_len = haversine_np(ends_arr[:, 0], ends_arr[:, 1], ends_arr[:, 2], ends_arr[:, 3])
+    edge_cum0 = np.zeros_like(edge_len)
+    run_len = np.zeros(len(run_conduit))
+    for s, (lo, hi) in enumerate(zip(seg_start, seg_start[1:])):
+        cum = np.cumsum(edge_len[lo:hi])
+        edge_cum0[lo + 1:hi] = cum[:-1]
+        run_len[s] = cum[-1]
+
+    return ConduitIndex(
+        conduit_meta=[(c.get("id", ""), c.get("vetro_id", "")) for c in conduits],
+        run_conduit=np.asarray(run_conduit, dtype=np.intp),
+        seg_start=np.asarray(seg_start, dtype=np.intp),
+        ends=ends_arr,
+        bbox=bbox,
+        edge_seg=np.asarray(edge_seg, dtype=np.intp),
+        edge_len=edge_len,
+        edge_bearing=bearing_np(ends_arr[:, 0], ends_arr[:, 1], ends_arr[:, 2], ends_arr[:, 3]),
+        edge_cum0=edge_cum0,
+        run_len=run_len,
+        oversized=oversized,
+        grid=grid,
+        cells=cells,
+    )
+
+
+def _vault_edge_pairs(vault_coords: List[Tuple[float, float]], grid: Dict[Tuple[int, int], List[int]],
+                      tol_m: float, oversized: List[int] = ()) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    (vi, ej) index arrays of every vault / candidate edge pair, vault-major,
+    edges ascending. Candidates are the grid hits plus every oversized edge.
+    """
+    vi: List[int] = []
+    ej: List[int] = []
+    oversized = list(oversized)
+    for v, (vlat, vlon) in enumerate(vault_coords):
+        cand = _grid_candidates(grid, vlat, vlon, tol_m)
+        if oversized:
+            cand = sorted(cand + oversized)
+        vi.extend([v] * len(cand))
+        ej.extend(cand)
+    return np.asarray(vi, dtype=np.intp), np.asarray(ej, dtype=np.intp)
+
+
+def _vault_edge_hits(vault_coords: List[Tuple[float, float]], index: ConduitIndex,
+                     tol_m: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    (vi, ej, d_m, t) for every vault / edge pair within tol_m, grouped by vault.
+    With numba the _vault_kernels scan searches and measures in one pass;
+    otherwise the grid picks the candidates and _ptseg_distance_t_np measures
+    them all at once. Either way only edges whose box, padded by tol_m as in
+    _grid_candidates, holds the vault get the distance math.
+    """
+    pts = np.asarray(vault_coords, dtype=np.float64).reshape(-1, 2)
+    if _vault_kernels.AVAILABLE:
+        return _vault_kernels.edge_pairs_within(pts, index.ends, index.bbox, index.cells, tol_m)
+    vi, ej = _vault_edge_pairs(vault_coords, index.grid, tol_m, index.oversized.tolist())
+    plat, plon, box = pts[vi, 0], pts[vi, 1], index.bbox[ej]
+    pad_lat = tol_m / 111000.0
+    pad_lon = 1.1 * pad_lat / np.maximum(np.cos(np.radians(plat)), 1e-6)
+    inside = ((plat >= box[:, 0] - pad_lat) & (plat <= box[:, 2] + pad_lat)
+              & (plon >= box[:, 1] - pad_lon) & (plon <= box[:, 3] + pad_lon))
+    vi, ej = vi[inside], ej[inside]
+    d_m, t = _ptseg_distance_t_np(pts[vi, 0], pts[vi, 1], index.ends[ej])
+    hit = d_m <= tol_m
+    return vi[hit], ej[hit], d_m[hit], t[hit]
+
+
+def _vault_ids(vault_coords: List[Tuple[float, float]], vault_map: Dict[Tuple[float, float], str]) -> List[str]:
+    """vetro_id of every vault, aligned with vault_coords: one rounded-key lookup per vault."""
+    return [vault_map.get((round(vlat, 6), round(vlon, 6)), "") for (vlat, vlon) in vault_coords]
+
+
+def _ptseg_distance_t_np(plat: np.ndarray, plon: np.ndarray, ends: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Point-to-segment distance (meters) and the clamped projection parameter t
+    in [0,1], for arrays of points against matching rows of ends
+    (alat, alon, blat, blon). Each pair is projected to a local equirectangular
+    plane around the mean latitude of its three points (very accurate at these
+    small tolerances); a zero-length edge measures to its endpoint with t=0.
+    """
+    alat, alon, blat, blon = ends[:, 0], ends[:, 1], ends[:, 2], ends[:, 3]
+    lat0 = (plat + alat + blat) / 3.0
+    m_per_deg_lat = 111320.0
+    m_per_deg_lon = 111320.0 * np.cos(np.radians(lat0))
+
+    ax, ay = alon * m_per_deg_lon, alat * m_per_deg_lat
+    bx, by = blon * m_per_deg_lon, blat * m_per_deg_lat
+    px, py = plon * m_per_deg_lon, plat * m_per_deg_lat
+
+    vx, vy = (bx - ax), (by - ay)
+    wx, wy = (px - ax), (py - ay)
+    denom = (vx * vx + vy * vy)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = np.where(denom > 0.0, (wx * vx + wy * vy) / denom, 0.0)
+
+    cx = np.where(t < 0.0, ax, np.where(t > 1.0, bx, ax + t * vx))
+    cy = np.where(t < 0.0, ay, np.where(t > 1.0, by, ay + t * vy))
+    dx, dy = (px - cx), (py - cy)
+    return np.sqrt(dx * dx + dy * dy), np.clip(t, 0.0, 1.0)
+
+
+def _collect_conduit_vertices(conduits: Iterable[dict]) -> List[Tuple[float,float]]:
+    verts: List[Tuple[float,float]] = []
+    for c in conduits:
+        for seg in c.get("segments", []):
+            verts.extend(seg)
+    return verts
+
+
+def _distance_along(cum: List[float], i0: int, i1: int) -> float:
+    """
+    Path distance (meters) along a run from vertex i0 to i1, given the run's
+    prefix sums (cum[j] = along-run distance to vertex j).
+    """
+    return abs(cum[i1] - cum[i0])
 
 
 # ---------------------------------
 # A) Vault must sit on conduit
 # ---------------------------------
 
-def find_vaults_missing_conduit(tolerance_ft: float | None = None) -> List[dict]:
+def find_vaults_missing_conduit(tolerance_ft: float | None = None,
+                                conduit_index: ConduitIndex | None = None,
+                                vaults: Tuple[list, dict] | None = None) -> List[dict]:
     """
     Every vault coordinate must have conduit *under it*.
 
     Now checks distance to the nearest *segment* (not only conduit vertices).
 
+    conduit_index / vaults: preloaded ConduitIndex and load_features("vault", "vetro_id")
+    result (run_all_vault_checks passes both); loaded here when omitted.
+
     Returns rows:
       { "Vault Vetro ID": <str>, "Issue": "No Conduit at vault" }
     """
-    from math import cos, radians, sqrt
-
-    conduits = _load_conduits()
-    vault_coords, vault_map = load_features("vault", "vetro_id")
+    index = conduit_index if conduit_index is not None else _conduit_edge_index(_conduit_files_key())
+    vault_coords, vault_map = vaults if vaults is not None else load_features("vault", "vetro_id")
 
     # Allow an override, else fall back to the global threshold (~3 ft).
     M_TO_FT = 3.28084
     tol_m = (float(tolerance_ft) / M_TO_FT) if tolerance_ft is not None else THRESHOLD_M
 
-    def _ptseg_distance_m(
-        p: Tuple[float, float],
-        a: Tuple[float, float],
-        b: Tuple[float, float],
-    ) -> float:
-        """
-        Approximate point-to-segment distance in meters by projecting to a local
-        equirectangular plane (very accurate at these small tolerances).
-        """
-        plat, plon = p
-        alat, alon = a
-        blat, blon = b
-
-        lat0 = (plat + alat + blat) / 3.0
-        m_per_deg_lat = 111320.0
-        m_per_deg_lon = 111320.0 * cos(radians(lat0))
-
-        # project to a flat plane around this latitude
-        ax, ay = alon * m_per_deg_lon, alat * m_per_deg_lat
-        bx, by = blon * m_per_deg_lon, blat * m_per_deg_lat
-        px, py = plon * m_per_deg_lon, plat * m_per_deg_lat
-
-        vx, vy = (bx - ax), (by - ay)
-        wx, wy = (px - ax), (py - ay)
-
-        denom = (vx * vx + vy * vy)
-        if denom <= 0.0:
-            # a and b are the same point; distance to that point
-            dx, dy = (px - ax), (py - ay)
-            return sqrt(dx * dx + dy * dy)
-
-        # projection parameter t clamped to [0,1]
-        t = (wx * vx + wy * vy) / denom
-        if t < 0.0:
-            cx, cy = ax, ay
-        elif t > 1.0:
-            cx, cy = bx, by
-        else:
-            cx, cy = (ax + t * vx), (ay + t * vy)
-
-        dx, dy = (px - cx), (py - cy)
-        return sqrt(dx * dx + dy * dy)
+    # Distance to the nearest *segment*: every vault against the edges filed near it
+    if _vault_kernels.AVAILABLE:
+        # compiled scan that stops at the first edge within tolerance
+        pts = np.asarray(vault_coords, dtype=np.float64).reshape(-1, 2)
+        on_conduit_mask = _vault_kernels.any_edge_within(pts, index.ends, index.bbox, index.cells, tol_m)
+    else:
+        vi, _, _, _ = _vault_edge_hits(vault_coords, index, tol_m)
+        on_conduit_mask = np.zeros(len(vault_coords), dtype=bool)
+        on_conduit_mask[vi] = True
 
     out: List[dict] = []
-    for (vlat, vlon) in vault_coords:
-        on_conduit = False
-
-        # Early-exit as soon as any segment is within tolerance
-        for c in conduits:
-            for seg in c.get("segments", []):
-                if len(seg) < 2:
-                    continue
-                # walk segment edges
-                for i in range(1, len(seg)):
-                    if _ptseg_distance_m((vlat, vlon), seg[i - 1], seg[i]) <= tol_m:
-                        on_conduit = True
-                        break
-                if on_conduit:
-                    break
-            if on_conduit:
-                break
-
+    for (vlat, vlon), on_conduit in zip(vault_coords, on_conduit_mask.tolist()):
         if not on_conduit:
             out.append({
                 "Vault Vetro ID": vault_map.get((round(vlat, 6), round(vlon, 6)), ""),
@@ -222,7 +362,9 @@ def find_vaults_missing_conduit(tolerance_ft: float | None = None) -> List[dict]
     return out
 
 
-def find_vault_spacing_issues(max_gap_ft: float = 500.0) -> List[dict]:
+def find_vault_spacing_issues(max_gap_ft: float = 500.0,
+                              conduit_index: ConduitIndex | None = None,
+                              vaults: Tuple[list, dict] | None = None) -> List[dict]:
     """
     Walk each conduit polyline; project touching vaults to the *nearest segment*
     (not just the nearest vertex); compute along-run distances between consecutive
@@ -230,6 +372,9 @@ def find_vault_spacing_issues(max_gap_ft: float = 500.0) -> List[dict]:
 
     If a run has <2 vaults and its total length > max_gap_ft, flag the entire run.
 
+    conduit_index / vaults: preloaded ConduitIndex and load_features("vault", "vetro_id")
+    result (run_all_vault_checks passes both); loaded here when omitted.
+
     Returns rows:
       {
         "Conduit ID": ,
@@ -241,119 +386,73 @@ def find_vault_spacing_issues(max_gap_ft: float = 500.0) -> List[dict]:
         "Issue": "Vault spacing exceeds 500 ft"
       }
     """
-    from math import cos, radians, sqrt
-
-    def _ptseg_distance_and_t_m(
-        p: Tuple[float, float],
-        a: Tuple[float, float],
-        b: Tuple[float, float],
-    ) -> Tuple[float, float]:
-        """
-        Point-to-segment perpendicular distance (meters) and the clamped
-        projection parameter t in [0,1] using a local equirectangular plane.
-        """
-        plat, plon = p
-        alat, alon = a
-        blat, blon = b
-
-        lat0 = (plat + alat + blat) / 3.0
-        m_per_deg_lat = 111320.0
-        m_per_deg_lon = 111320.0 * cos(radians(lat0))
-
-        ax, ay = alon * m_per_deg_lon, alat * m_per_deg_lat
-        bx, by = blon * m_per_deg_lon, blat * m_per_deg_lat
-        px, py = plon * m_per_deg_lon, plat * m_per_deg_lat
-
-        vx, vy = (bx - ax), (by - ay)
-        wx, wy = (px - ax), (py - ay)
-        denom = (vx * vx + vy * vy)
-        if denom <= 0.0:
-            # a and b coincide – distance to that point, t=0
-            dx, dy = (px - ax), (py - ay)
-            return sqrt(dx * dx + dy * dy), 0.0
-
-        t = (wx * vx + wy * vy) / denom
-        if t < 0.0:
-            cx, cy = ax, ay
-            t = 0.0
-        elif t > 1.0:
-            cx, cy = bx, by
-            t = 1.0
-        else:
-            cx, cy = (ax + t * vx), (ay + t * vy)
-
-        dx, dy = (px - cx), (py - cy)
-        return sqrt(dx * dx + dy * dy), t
-
-    vault_coords, vault_map = load_features("vault", "vetro_id")
+    vault_coords, vault_map = vaults if vaults is not None else load_features("vault", "vetro_id")
+    index = conduit_index if conduit_index is not None else _conduit_edge_index(_conduit_files_key())
     out: List[dict] = []
     lim_m = float(max_gap_ft) / M_TO_FT
 
-    for c in _load_conduits():
-        for seg in c.get("segments", []):
-            if not seg or len(seg) < 2:
-                continue
-
-            # Precompute cumulative along-run vertex distances (meters)
-            cum: List[float] = [0.0]
-            for i in range(1, len(seg)):
-                a, b = seg[i - 1], seg[i]
-                cum.append(cum[-1] + haversine(a[0], a[1], b[0], b[1]))
-
-            run_len_m = cum[-1]
-            run_len_ft = run_len_m * M_TO_FT
-
-            # Project every vault to this polyline; keep those within tolerance
-            touching: List[tuple[float, str]] = []  # (along_m, vault_id)
-            for (vlat, vlon) in vault_coords:
-                best_dist_m = float("inf")
-                best_along_m = None
-
-                # scan each edge
-                for i in range(1, len(seg)):
-                    a, b = seg[i - 1], seg[i]
-                    d_m, t = _ptseg_distance_and_t_m((vlat, vlon), a, b)
-                    if d_m < best_dist_m:
-                        # along = cum up to edge-start + t * edge length (geodesic)
-                        edge_len_m = haversine(a[0], a[1], b[0], b[1])
-                        along_m = cum[i - 1] + t * edge_len_m
-                        best_dist_m = d_m
-                        best_along_m = along_m
-
-                if best_along_m is not None and best_dist_m <= THRESHOLD_M:
-                    v_id = vault_map.get((round(vlat, 6), round(vlon, 6)), "")
-                    touching.append((best_along_m, v_id))
-
-            # Sort by along-run position
-            touching.sort(key=lambda t: t[0])
-
-            if len(touching) < 2 and run_len_ft > float(max_gap_ft):
-                out.append({
-                    "Conduit ID": c.get("id", ""),
-                    "Conduit Vetro ID": c.get("vetro_id", ""),
-                    "From Vault": touching[0][1] if touching else "(none)",
-                    "To Vault": "(none)",
-                    "Distance (ft)": round(run_len_ft, 1),
-                    "Limit (ft)": float(max_gap_ft),
-                    "Issue": "Vault spacing exceeds 500 ft",
-                })
-                continue
+    # Project every vault onto each run it is near. Every edge within THRESHOLD_M
+    # comes back, so a run's nearest hit is the vault's nearest edge on that run.
+    vi, ej, d_m, t = _vault_edge_hits(vault_coords, index, THRESHOLD_M)
+    run = index.edge_seg[ej]
+    # Nearest edge per (vault, run): first pair once sorted by vault, run, distance, edge
+    order = np.lexsort((ej, d_m, run, vi))
+    vi, ej, run, t = vi[order], ej[order], run[order], t[order]
+    first = np.ones(len(vi), dtype=bool)
+    first[1:] = (vi[1:] != vi[:-1]) | (run[1:] != run[:-1])
+    vi, ej, run, t = vi[first], ej[first], run[first], t[first]
+    # along = cum up to edge-start + t * edge length (geodesic)
+    along = index.edge_cum0[ej] + t * index.edge_len[ej]
+
+    # Every run's vaults by along-run position (vault order on ties), and the
+    # gap from each vault to the previous one on the same run, in one pass
+    order = np.lexsort((vi, along, run))
+    vi, run, along = vi[order], run[order], along[order]
+    per_run = np.bincount(run, minlength=len(index.run_conduit))
+    first_at = np.cumsum(per_run) - per_run        # each run's first vault in the sorted pairs
+    gap_m = np.diff(along)
+    over = (run[1:] == run[:-1]) & (gap_m > lim_m)
+
+    run_len_ft = index.run_len * M_TO_FT
+    # A run with <2 vaults is flagged whole; gaps only exist with 2 or more
+    short = (per_run < 2) & (run_len_ft > float(max_gap_ft))
+    has_gap = np.zeros(len(per_run), dtype=bool)
+    has_gap[run[1:][over]] = True
+
+    vault_ids = _vault_ids(vault_coords, vault_map)
+    vi_l, gap_l = vi.tolist(), gap_m.tolist()
+    over_at = np.flatnonzero(over).tolist()       # pair k -> gap between sorted vaults k and k+1
+    run_l = run.tolist()
+    gaps_by_run: Dict[int, List[int]] = {}
+    for k in over_at:
+        gaps_by_run.setdefault(run_l[k], []).append(k)
+
+    for s in np.flatnonzero(short | has_gap).tolist():
+        conduit_id, conduit_vetro_id = index.conduit_meta[index.run_conduit[s]]
+
+        if short[s]:
+            out.append({
+                "Conduit ID": conduit_id,
+                "Conduit Vetro ID": conduit_vetro_id,
+                "From Vault": vault_ids[vi_l[first_at[s]]] if per_run[s] else "(none)",
+                "To Vault": "(none)",
+                "Distance (ft)": round(float(run_len_ft[s]), 1),
+                "Limit (ft)": float(max_gap_ft),
+                "Issue": "Vault spacing exceeds 500 ft",
+            })
+            continue
 
-            # Check gaps between consecutive projected positions
-            for i in range(1, len(touching)):
-                a_along_m, v0 = touching[i - 1]
-                b_along_m, v1 = touching[i]
-                gap_m = b_along_m - a_along_m
-                if gap_m > lim_m:
-                    out.append({
-                        "Conduit ID": c.get("id", ""),
-                        "Conduit Vetro ID": c.get("vetro_id", ""),
-                        "From Vault": v0 or "(unknown)",
-                        "To Vault": v1 or "(unknown)",
-                        "Distance (ft)": round(gap_m * M_TO_FT, 1),
-                        "Limit (ft)": float(max_gap_ft),
-                        "Issue": "Vault spacing exceeds 500 ft",
-                    })
+        # Gaps between consecutive projected positions
+        for k in gaps_by_run[s]:
+            out.append({
+                "Conduit ID": conduit_id,
+                "Conduit Vetro ID": conduit_vetro_id,
+                "From Vault": vault_ids[vi_l[k]] or "(unknown)",
+                "To Vault": vault_ids[vi_l[k + 1]] or "(unknown)",
+                "Distance (ft)": round(gap_l[k] * M_TO_FT, 1),
+                "Limit (ft)": float(max_gap_ft),
+                "Issue": "Vault spacing exceeds 500 ft",
+            })
 
     return out
 
@@ -361,7 +460,9 @@ def find_vault_spacing_issues(max_gap_ft: float = 500.0) -> List[dict]:
 # ------------------------------------------------------------------------
 # C) Sharp bends (<130° included) need a vault at bend or within 300 ft
 # ------------------------------------------------------------------------
-def find_bend_vault_issues(angle_threshold_deg: float = 130.0, max_distance_ft: float = 300.0) -> List[dict]:
+def find_bend_vault_issues(angle_threshold_deg: float = 130.0, max_distance_ft: float = 300.0,
+                           conduit_index: ConduitIndex | None = None,
+                           vaults: Tuple[list, dict] | None = None) -> List[dict]:
     """
     For every interior vertex in each conduit run:
       - Compute included_angle = 180 - |bearing_diff|.
@@ -370,6 +471,9 @@ def find_bend_vault_issues(angle_threshold_deg: float = 130.0, max_distance_ft:
           • the nearest vault along the run within max_distance_ft.
       - Otherwise flag.
 
+    conduit_index / vaults: preloaded ConduitIndex and load_features("vault", "vetro_id")
+    result (run_all_vault_checks passes both); loaded here when omitted.
+
     Returns rows:
       {
         "Conduit ID": <id>,
@@ -381,78 +485,102 @@ def find_bend_vault_issues(angle_threshold_deg: float = 130.0, max_distance_ft:
         "Issue": "Sharp bend without nearby vault"
       }
     """
-    vault_coords, vault_map = load_features("vault", "vetro_id")
+    vault_coords, vault_map = vaults if vaults is not None else load_features("vault", "vetro_id")
+    vault_grid = _grid_index((vlat, vlon, vlat, vlon) for (vlat, vlon) in vault_coords)
+    vault_ids = _vault_ids(vault_coords, vault_map)
+    index = conduit_index if conduit_index is not None else _conduit_edge_index(_conduit_files_key())
     lim_m = float(max_distance_ft) / M_TO_FT
 
     out: List[dict] = []
 
-    for c in _load_conduits():
-        for seg in c.get("segments", []):
-            if len(seg) < 3:
-                continue
-
-            # precompute bearings for consecutive edges
-            bearings: List[float] = []
-            for i in range(1, len(seg)):
-                a = seg[i-1]; b = seg[i]
-                bearings.append(bearing(a[0], a[1], b[0], b[1]))
-
-            # interior vertices only
-            for i in range(1, len(seg) - 1):
-                b1 = bearings[i-1]
-                b2 = bearings[i]
-                turn = _angle_diff(b1, b2)     # 0 straight, 180 U-turn
-                included = 180.0 - turn        # smaller = sharper
-
-                if included >= float(angle_threshold_deg):
-                    continue  # not sharp
-
-                bend_pt = seg[i]
+    # Included angle at every interior vertex at once: edges k and k+1 meet at
+    # a vertex when they belong to the same run
+    b = index.edge_bearing
+    turn = np.abs((b[:-1] - b[1:] + 180) % 360 - 180)   # 0 straight, 180 U-turn
+    included = 180.0 - turn                              # smaller = sharper
+    sharp = np.flatnonzero((index.edge_seg[:-1] == index.edge_seg[1:]) & (included < float(angle_threshold_deg)))
+
+    # Only the sharp bends are visited, grouped by run in file order
+    s = -1
+    for k, bend_angle in zip(sharp.tolist(), included[sharp].tolist()):
+        if index.edge_seg[k] != s:
+            s = int(index.edge_seg[k])
+            conduit_id, conduit_vetro_id = index.conduit_meta[index.run_conduit[s]]
+            lo, hi = int(index.seg_start[s]), int(index.seg_start[s + 1])
+            # the run's vertices: every edge start, then the last edge end
+            seg = [tuple(p) for p in index.ends[lo:hi, :2].tolist()]
+            seg.append(tuple(index.ends[hi - 1, 2:].tolist()))
+            seg_cum: List[float] | None = None
+            # vertex index -> vault id for vaults sitting on this run (built at the first bend needing it)
+            touching_ix_to_id: Dict[int, str] | None = None
+
+        i = k + 1 - lo
+        bend_pt = seg[i]
+
+        # vault exactly at the bend? Vault and conduit coordinates are both rounded
+        # to 6 decimals, so a vault on the vertex itself is one vault_map lookup;
+        # the grid/haversine test only runs for near-but-not-identical points.
+        has_vault_here = bend_pt in vault_map or any(
+            haversine(bend_pt[0], bend_pt[1], *vault_coords[v]) <= THRESHOLD_M
+            for v in _grid_candidates(vault_grid, bend_pt[0], bend_pt[1], THRESHOLD_M)
+        )
+        if has_vault_here:
+            continue
 
-                # vault exactly at the bend?
-                has_vault_here = any(haversine(bend_pt[0], bend_pt[1], vlat, vlon) <= THRESHOLD_M
-                                     for (vlat, vlon) in vault_coords)
-                if has_vault_here:
-                    continue
+        # nearest vault along-run from this vertex
+        if touching_ix_to_id is None:
+            # Closest run vertex (by haversine) of each vault near the run. A vault
+            # within THRESHOLD_M of a vertex is always one of its grid candidates,
+            # so its closest candidate vertex is its closest vertex overall
+            # whenever that one is within THRESHOLD_M.
+            closest: Dict[int, Tuple[float, int]] = {}  # vault -> (dist_m, vertex)
+            for j, (plat, plon) in enumerate(seg):
+                for v in _grid_candidates(vault_grid, plat, plon, THRESHOLD_M):
+                    vlat, vlon = vault_coords[v]
+                    d = haversine(vlat, vlon, plat, plon)
+                    if v not in closest or d < closest[v][0]:
+                        closest[v] = (d, j)
+
+            touching_ix_to_id = {}
+            for v in sorted(closest):
+                d, j = closest[v]
+                if d <= THRESHOLD_M:
+                    touching_ix_to_id[j] = vault_ids[v]
+
+        if seg_cum is None:
+            seg_cum = index.edge_cum0[lo:hi].tolist() + [float(index.run_len[s])]
+
+        nearest_d_m = float("inf")
+        nearest_v_id = "(none)"
+
+        # search left
+        for j in range(i-1, -1, -1):
+            if j in touching_ix_to_id:
+                d = _distance_along(seg_cum, j, i)
+                nearest_d_m = d
+                nearest_v_id = touching_ix_to_id[j] or "(unknown)"
+                break
+        # search right
+        for j in range(i+1, len(seg)):
+            if j in touching_ix_to_id:
+                d = _distance_along(seg_cum, i, j)
+                if d < nearest_d_m:
+                    nearest_d_m = d
+                    nearest_v_id = touching_ix_to_id[j] or "(unknown)"
+                break
 
-                # nearest vault along-run from this vertex
-                touching_ix_to_id: Dict[int, str] = {}
-                for (vlat, vlon) in vault_coords:
-                    j = _closest_vertex_index(seg, (vlat, vlon))
-                    if haversine(vlat, vlon, seg[j][0], seg[j][1]) <= THRESHOLD_M:
-                        touching_ix_to_id[j] = vault_map.get((round(vlat, 6), round(vlon, 6)), "")
-
-                nearest_d_m = float("inf")
-                nearest_v_id = "(none)"
-
-                # search left
-                for j in range(i-1, -1, -1):
-                    if j in touching_ix_to_id:
-                        d = _distance_along(seg, j, i)
-                        nearest_d_m = d
-                        nearest_v_id = touching_ix_to_id[j] or "(unknown)"
-                        break
-                # search right
-                for j in range(i+1, len(seg)):
-                    if j in touching_ix_to_id:
-                        d = _distance_along(seg, i, j)
-                        if d < nearest_d_m:
-                            nearest_d_m = d
-                            nearest_v_id = touching_ix_to_id[j] or "(unknown)"
-                        break
-
-                if nearest_d_m <= lim_m:
-                    continue
+        if nearest_d_m <= lim_m:
+            continue
 
-                out.append({
-                    "Conduit ID": c.get("id", ""),
-                    "Conduit Vetro ID": c.get("vetro_id", ""),
-                    "Bend Angle (deg)": round(included, 1),
-                    "Nearest Vault": nearest_v_id,
-                    "Distance (ft)": (round(nearest_d_m * M_TO_FT, 1) if nearest_d_m != float("inf") else ""),
-                    "Limit (ft)": float(max_distance_ft),
-                    "Issue": "Sharp bend without nearby vault",
-                })
+        out.append({
+            "Conduit ID": conduit_id,
+            "Conduit Vetro ID": conduit_vetro_id,
+            "Bend Angle (deg)": round(bend_angle, 1),
+            "Nearest Vault": nearest_v_id,
+            "Distance (ft)": (round(nearest_d_m * M_TO_FT, 1) if nearest_d_m != float("inf") else ""),
+            "Limit (ft)": float(max_distance_ft),
+            "Issue": "Sharp bend without nearby vault",
+        })
 
     return out
 
@@ -461,8 +589,11 @@ def find_bend_vault_issues(angle_threshold_deg: float = 130.0, max_distance_ft:
 # Aggregator (for convenience)
 # ---------------------------------------
 def run_all_vault_checks() -> dict[str, List[dict]]:
+    # Load conduits and vaults once and hand the same data to every check
+    index = _conduit_edge_index(_conduit_files_key())
+    vaults = load_features("vault", "vetro_id")
     return {
-        "vaults_missing_conduit":   find_vaults_missing_conduit(),
-        "vault_spacing_issues":     find_vault_spacing_issues(),
-        "bend_vault_issues":        find_bend_vault_issues(),
+        "vaults_missing_conduit":   find_vaults_missing_conduit(conduit_index=index, vaults=vaults),
+        "vault_spacing_issues":     find_vault_spacing_issues(conduit_index=index, vaults=vaults),
+        "bend_vault_issues":        find_bend_vault_issues(conduit_index=index, vaults=vaults),
     }
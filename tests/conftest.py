@@ -0,0 +1,20 @@
+# tests/conftest.py
+# Make the repo importable from tests/ and give the rule modules a minimal
+# modules.config when the local one (not tracked) is absent.
+
+import os
+import sys
+import types
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import modules  # noqa: E402
+
+try:
+    import modules.config  # noqa: F401
+except ImportError:
+    _cfg = types.ModuleType("modules.config")
+    _cfg.DATA_DIR = ""
+    _cfg.ID_COL = "ID"
+    sys.modules["modules.config"] = _cfg
+    modules.config = _cfg
@@ -0,0 +1,150 @@
+# tests/test_proximity_kernels.py
+# Brute force vs NumPy path vs numba kernels for the grid-based proximity
+# searches in vault_rules (_vault_kernels) and slack_loops (_numeric).
+
+import json
+import math
+import random
+
+import numpy as np
+import pytest
+
+import modules.config
+from modules.basic.distance_utils import THRESHOLD_M
+from modules.simple_scripts import _numeric, _vault_kernels, slack_loops, vault_rules
+
+needs_numba = pytest.mark.skipif(not _vault_kernels.AVAILABLE, reason="numba not installed")
+
+M_PER_DEG = 111320.0
+CELL = vault_rules._CELL_DEG
+
+
+def _random_layout(seed, lat_c=35.0, lon_c=-97.0):
+    """Edges ((alat, alon), (blat, blon)) and vault points around (lat_c, lon_c)."""
+    rnd = random.Random(seed)
+    k = math.cos(math.radians(lat_c))
+    edges = []
+    for _ in range(150):
+        lat = lat_c + rnd.uniform(-0.01, 0.01)
+        lon = lon_c + rnd.uniform(-0.01, 0.01)
+        step = rnd.choice([3, 20, 80, 200]) / M_PER_DEG
+        ang = rnd.uniform(0, 2 * math.pi)
+        edges.append(((lat, lon), (lat + step * math.sin(ang), lon + step * math.cos(ang) / k)))
+    # short edges straddling cell lines, so they are filed under several cells
+    for _ in range(40):
+        i = math.floor(lat_c / CELL) + rnd.randint(-8, 8)
+        j = math.floor(lon_c / CELL) + rnd.randint(-8, 8)
+        a = ((i + rnd.uniform(0.9, 1.0)) * CELL, (j + rnd.uniform(0.9, 1.0)) * CELL)
+        b = ((i + 1 + rnd.uniform(0.0, 0.1)) * CELL, (j + 1 + rnd.uniform(0.0, 0.1)) * CELL)
+        edges.append((a, b))
+    # a zero-length edge and a long diagonal edge (oversized for the grid)
+    edges.append(((lat_c, lon_c), (lat_c, lon_c)))
+    edges.append(((lat_c - 0.03, lon_c - 0.03), (lat_c + 0.03, lon_c + 0.02)))
+
+    pts = []
+    for _ in range(400):
+        r = rnd.random()
+        (alat, alon), (blat, blon) = rnd.choice(edges)
+        if r < 0.7:
+            t = rnd.choice([0.0, 1.0, rnd.random()])
+            off = rnd.choice([0.0, 0.5, 0.9, 2.0, 10.0, 14.0]) / M_PER_DEG
+            ang = rnd.uniform(0, 2 * math.pi)
+            pts.append((alat + t * (blat - alat) + off * math.sin(ang),
+                        alon + t * (blon - alon) + off * math.cos(ang) / k))
+        elif r < 0.85:
+            # right on a cell corner
+            pts.append((round(alat / CELL) * CELL, round(alon / CELL) * CELL))
+        else:
+            pts.append((lat_c + rnd.uniform(-0.012, 0.012), lon_c + rnd.uniform(-0.012, 0.012)))
+    return edges, pts
+
+
+def _write_conduits(path, edges):
+    feats = [
+        {"type": "Feature", "properties": {"ID": f"C{n}"},
+         "geometry": {"type": "LineString", "coordinates": [[alon, alat], [blon, blat]]}}
+        for n, ((alat, alon), (blat, blon)) in enumerate(edges)
+    ]
+    path.write_text(json.dumps({"type": "FeatureCollection", "features": feats}))
+
+
+def _build_index(monkeypatch, tmp_path, edges, compiled):
+    _write_conduits(tmp_path / "p-conduit.geojson", edges)
+    monkeypatch.setattr(modules.config, "DATA_DIR", str(tmp_path), raising=False)
+    monkeypatch.setattr(_vault_kernels, "AVAILABLE", compiled)
+    vault_rules._conduit_edge_index.cache_clear()
+    return vault_rules._conduit_edge_index(vault_rules._conduit_files_key())
+
+
+def _brute_hits(pts, ends, tol_m):
+    """Every (point, edge) pair measured, no grid."""
+    vi, ej = np.divmod(np.arange(len(pts) * len(ends)), len(ends))
+    d_m, t = vault_rules._ptseg_distance_t_np(pts[vi, 0], pts[vi, 1], ends[ej])
+    hit = d_m <= tol_m
+    return vi[hit], ej[hit], d_m[hit], t[hit]
+
+
+def _by_pair(vi, ej, d_m, t):
+    order = np.lexsort((ej, vi))
+    return vi[order], ej[order], d_m[order], t[order]
+
+
+@pytest.mark.parametrize("seed", range(4))
+@pytest.mark.parametrize("tol_m", [THRESHOLD_M, 15.0])
+@pytest.mark.parametrize("compiled", [False, pytest.param(True, marks=needs_numba)])
+def test_vault_edge_hits_match_brute_force(monkeypatch, tmp_path, seed, tol_m, compiled):
+    edges, pts = _random_layout(seed, lat_c=[35.0, 61.5, -33.9][seed % 3])
+    index = _build_index(monkeypatch, tmp_path, edges, compiled)
+    assert len(index.oversized) >= 1
+    pts_arr = np.asarray(pts)
+
+    want = _by_pair(*_brute_hits(pts_arr, index.ends, tol_m))
+    got = _by_pair(*vault_rules._vault_edge_hits(pts, index, tol_m))
+    np.testing.assert_array_equal(got[0], want[0])
+    np.testing.assert_array_equal(got[1], want[1])
+    np.testing.assert_allclose(got[2], want[2], rtol=1e-12, atol=1e-9)
+    np.testing.assert_allclose(got[3], want[3], rtol=1e-12, atol=1e-12)
+
+    if compiled:
+        any_hit = _vault_kernels.any_edge_within(pts_arr, index.ends, index.bbox, index.cells, tol_m)
+        expected = np.zeros(len(pts), dtype=bool)
+        expected[want[0]] = True
+        np.testing.assert_array_equal(any_hit, expected)
+
+
+@needs_numba
+def test_vault_kernels_all_edges_oversized(monkeypatch, tmp_path):
+    edges, pts = _random_layout(7)
+    monkeypatch.setattr(vault_rules, "_MAX_EDGE_CELLS", 0)
+    index = _build_index(monkeypatch, tmp_path, edges, True)
+    assert len(index.oversized) == len(index.ends)
+
+    want = _by_pair(*_brute_hits(np.asarray(pts), index.ends, THRESHOLD_M))
+    got = _by_pair(*vault_rules._vault_edge_hits(pts, index, THRESHOLD_M))
+    np.testing.assert_array_equal(got[0], want[0])
+    np.testing.assert_array_equal(got[1], want[1])
+
+
+@pytest.mark.parametrize("seed", range(4))
+@pytest.mark.parametrize("compiled", [False, pytest.param(True, marks=needs_numba)])
+def test_near_pairs_match_brute_force(monkeypatch, seed, compiled):
+    monkeypatch.setattr(_numeric, "AVAILABLE", compiled)
+    rnd = random.Random(seed)
+    lat_c = [35.0, 61.5, -33.9, 0.0][seed]
+    cell = slack_loops._CELL_DEG
+    span = 40 * cell
+    pts = np.asarray([(lat_c + rnd.uniform(-span, span), -97.0 + rnd.uniform(-span, span)) for _ in range(300)])
+    # queries on, beside and between the points, some on cell boundaries
+    query = [(lat + rnd.uniform(-1.5, 1.5) * cell, lon + rnd.uniform(-1.5, 1.5) * cell) for lat, lon in pts.tolist()]
+    query += [(math.floor(lat / cell) * cell, lon) for lat, lon in pts[:50].tolist()]
+
+    q_arr = np.asarray(query)
+    dy = (pts[None, :, 0] - q_arr[:, None, 0]) * slack_loops._M_PER_DEG
+    dx = (pts[None, :, 1] - q_arr[:, None, 1]) * slack_loops._M_PER_DEG * np.cos(np.radians(q_arr[:, None, 0]))
+    want = set(zip(*np.nonzero(dx * dx + dy * dy <= slack_loops._THRESHOLD_M2)))
+
+    qi, pj = slack_loops._near_pairs(query, pts)
+    got = list(zip(qi.tolist(), pj.tolist()))
+    assert len(got) == len(set(got))
+    assert set(got) == {(int(q), int(p)) for q, p in want}
+    assert qi.tolist() == sorted(qi.tolist())